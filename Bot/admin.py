@@ -5,6 +5,8 @@ from typing import Literal, Optional
 import utils
 
 from db import db
+from tracing import slowest_traces
+from views import view_registry
 
 
 class Admin(commands.Cog):
@@ -25,6 +27,22 @@ class Admin(commands.Cog):
         except commands.ExtensionFailed as e:
             await ctx.send(f'Failed to reload cog {cog}: {e}')
 
+    @commands.command(name='reload_catalog', hidden=True)
+    @commands.is_owner()
+    async def reload_catalog(self, ctx):
+        """Rebuilds the catalog and its indexes from the database and swaps them in."""
+        try:
+            report = await db.reload_catalog()
+        except Exception as e:
+            await ctx.send(f'Failed to reload catalog: {e}')
+            return
+
+        memory = f"{report['memory_delta'] / 1024 ** 2:+.1f} MiB RSS" if report['memory_delta'] is not None else "RSS unavailable"
+        await ctx.send(
+            f"Reloaded catalog {report['version'][:8]} ({'changed' if report['changed'] else 'unchanged'}) "
+            f"in {report['seconds'] * 1000:.0f} ms, {memory}."
+        )
+
     @commands.command(name='clear_all_commands', hidden=True)
     @commands.is_owner()
     async def clear_all_commands(self, ctx):
@@ -71,6 +89,83 @@ class Admin(commands.Cog):
         await ctx.send(f"Synced the tree to {ret}/{len(guilds)}.")
 
 
+    @commands.command(name='cache_stats', hidden=True)
+    @commands.is_owner()
+    async def cache_stats(self, ctx):
+        stats = db.get_identity_cache_stats()
+        await ctx.send(
+            f"Identity cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate), {stats['servers']} servers and {stats['players']} players cached."
+        )
+
+    @commands.command(name='pool_stats', hidden=True)
+    @commands.is_owner()
+    async def pool_stats(self, ctx):
+        stats = db.get_pool_stats()
+        wait = stats['acquire_wait']
+        lines = [
+            f"Pool: {stats['in_use']} in use, {stats['idle']} idle, {stats['waiting']} waiting "
+            f"(size {stats['size']}, {stats['min_size']}-{stats['max_size']}).",
+            f"Acquire wait: p50 {wait['p50_ms']:.2f} ms, p95 {wait['p95_ms']:.2f} ms, p99 {wait['p99_ms']:.2f} ms "
+            f"over {wait['count']} acquires.",
+        ]
+        for name, timing in list(stats['statements'].items())[:10]:
+            lines.append(
+                f"`{name}`: {timing['count']} runs, p50 {timing['p50_ms']:.2f} ms, p99 {timing['p99_ms']:.2f} ms, "
+                f"{timing['errors']} errors")
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name='db_stats', hidden=True)
+    @commands.is_owner()
+    async def db_stats(self, ctx, limit: int = 10):
+        methods = db.get_method_stats(limit)
+        if not methods:
+            await ctx.send("No Database calls recorded.")
+            return
+
+        lines = []
+        for name, stats in methods:
+            execution = stats['execution']
+            lines.append(
+                f"`{name}`: {stats['calls']} calls, p50 {execution['p50_ms']:.2f} / p95 {execution['p95_ms']:.2f} / "
+                f"p99 {execution['p99_ms']:.2f} ms, wait p95 {stats['acquire_wait']['p95_ms']:.2f} ms, "
+                f"{stats['rows']} rows, {stats['errors']} errors")
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name='db_instrumentation', hidden=True)
+    @commands.is_owner()
+    async def db_instrumentation(self, ctx, enabled: bool):
+        db.set_instrumentation(enabled)
+        await ctx.send(f"Database instrumentation {'enabled' if enabled else 'disabled'}.")
+
+    @commands.command(name='slow_traces', hidden=True)
+    @commands.is_owner()
+    async def slow_traces(self, ctx, limit: int = 5):
+        traces = slowest_traces(limit)
+        if not traces:
+            await ctx.send("No interactions traced yet.")
+            return
+
+        lines = []
+        for trace in traces:
+            breakdown = trace.breakdown()
+            other = trace.duration - sum(seconds for _, seconds in breakdown.values())
+            parts = [f"{kind} {seconds * 1000:.1f} ms x{count}" for kind, (count, seconds) in breakdown.items()]
+            parts.append(f"other {other * 1000:.1f} ms")
+            lines.append(f"**{trace.name}** {trace.duration * 1000:.1f} ms: {', '.join(parts)}")
+            for child in sorted(trace.children, key=lambda child: child.duration, reverse=True)[:5]:
+                lines.append(f"\u2003`{child.name}` {child.duration * 1000:.1f} ms")
+        await ctx.send("\n".join(lines)[:2000])
+
+    @commands.command(name='view_stats', hidden=True)
+    @commands.is_owner()
+    async def view_stats(self, ctx):
+        stats = view_registry.stats()
+        await ctx.send(
+            f"Live views: {stats['live_views']}/{view_registry.max_views}, "
+            f"~{stats['estimated_bytes'] / 1024:.1f} KiB retained, {stats['evictions']} evicted."
+        )
+
     # 🔒 This eval command is strictly limited to the bot owner for debugging and testing purposes. If there are any concerns please let me know.
 
     @commands.command(name='_eval', hidden=True)
@@ -1,17 +1,17 @@
 import discord
 import utils
-import json
 
 from discord import app_commands, Embed, Interaction, ButtonStyle
 from discord.ext import commands
-from discord.ui import Button, View, button
+from discord.ui import Button, DynamicItem, View, button
 
 from db import db
+from tracing import traced
+from views import PERSISTENT_VIEWS, CRAFT_TYPE_CODES, CRAFT_TYPES, TrackedView, view_registry
 
-with open('images.json', 'r') as file:
-    images = json.load(file)
+ITEMS_PER_PAGE = 4
 
-class PaginatedView(View):
+class PaginatedView(TrackedView):
     def __init__(self, embeds, author_id):
         super().__init__(timeout=None)
         self.author_id = author_id
@@ -50,10 +50,12 @@ class PaginatedView(View):
                 f"Don't click other people buttons {str(interaction.user.global_name)}!")
             return
         await interaction.response.defer(thinking=True)
+        view_registry.discard(self)
+        self.stop()
         await interaction.delete_original_response()
 
 
-class StandardView(View):
+class StandardView(TrackedView):
     def __init__(self, author_id):
         self.author_id = author_id
         super().__init__(timeout=None)
@@ -66,13 +68,56 @@ class StandardView(View):
                 f"Don't click other people buttons {str(interaction.user.global_name)}!")
             return
 
+        view_registry.discard(self)
+        self.stop()
         await interaction.delete_original_response()
 
 
+class CraftsPageButton(DynamicItem[Button], template=r"crafts:(?P<action>prev|next|close):(?P<author_id>\d+):(?P<craft_type>[MA]):(?P<page>\d+)"):
+    """Stateless /available_crafts navigation; the page a button leads to is carried in its custom_id"""
+
+    buttons = {
+        "prev": ("Previous", ButtonStyle.secondary),
+        "next": ("Next", ButtonStyle.secondary),
+        "close": ("Close", ButtonStyle.red)
+    }
+
+    def __init__(self, action, author_id, craft_type, page, disabled=False):
+        label, style = self.buttons[action]
+        super().__init__(Button(
+            label=label, style=style, disabled=disabled,
+            custom_id=f"crafts:{action}:{author_id}:{CRAFT_TYPE_CODES[craft_type]}:{page}"))
+        self.action = action
+        self.author_id = author_id
+        self.craft_type = craft_type
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["action"], int(match["author_id"]), CRAFT_TYPES[match["craft_type"]], int(match["page"]))
+
+    async def callback(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                f"Don't click other people buttons {str(interaction.user.global_name)}!", ephemeral=True)
+            return
+
+        if self.action == "close":
+            await interaction.response.defer()
+            await interaction.delete_original_response()
+            return
+
+        embed, view = await render_page(interaction, self.craft_type, self.page)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+
 class AvailableCrafts(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(CraftsPageButton)
+
     @app_commands.command(
         name="available_crafts",
         description="Show available items to craft."
@@ -83,9 +128,12 @@ class AvailableCrafts(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         role_color = await utils.get_role_color(interaction)
 
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        player = await db.get_player(db_unique_player_id, db_unique_server_id)
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
+
+        if PERSISTENT_VIEWS and craft_type in CRAFT_TYPE_CODES:
+            embed, view = await render_page(interaction, craft_type, 0, db_unique_player_id, player)
+            await interaction.followup.send(embed=embed, view=view)
+            return
 
         if craft_type == 'Medicine':
             items = await db.get_player_possible_medicines(db_unique_player_id)
@@ -100,7 +148,7 @@ class AvailableCrafts(commands.Cog):
         view = StandardView(interaction.user.id)
 
         if items:
-            embeds = await create_embeds(interaction, title, items)
+            embeds = await create_embeds(interaction, title, items, player)
 
             if len(embeds) > 1:
                 view = PaginatedView(embeds, interaction.user.id)
@@ -113,6 +161,8 @@ class AvailableCrafts(commands.Cog):
             embed.add_field(name="No available items to craft.", value="", inline=False)
             await interaction.followup.send(embed=embed, view=view)
 
+        await view_registry.register(view, interaction)
+
     async def cog_app_command_error(self, interaction, error: app_commands.AppCommandError):
         # Default error message
         message = None
@@ -134,11 +184,44 @@ class AvailableCrafts(commands.Cog):
             await interaction.response.send_message(message, ephemeral=True)
 
 
-async def create_embeds(interaction,title, items, items_per_embed=4):
+async def render_page(interaction, craft_type, page, db_unique_player_id=None, player=None):
+    """Builds one /available_crafts page from the player's current inventory, with its stateless buttons
+
+    Callers that have already resolved the player pass it in; button clicks leave it to be resolved here, once.
+    """
+    if player is None:
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
+
+    if craft_type == 'Medicine':
+        items = await db.get_player_possible_medicines(db_unique_player_id)
+        title = "Available Medicines"
+    else:
+        items = await db.get_player_possible_alchemy(db_unique_player_id)
+        title = "Available Alchemical Items"
+
+    # The inventory may have changed since the page was sent, so clamp to what is still there
+    page_count = max(1, -(-len(items) // ITEMS_PER_PAGE))
+    page = min(page, page_count - 1)
+
+    if items:
+        embed = (await create_embeds(interaction, title, items[page * ITEMS_PER_PAGE:(page + 1) * ITEMS_PER_PAGE], player))[0]
+    else:
+        embed = Embed(title=title, color=await utils.get_role_color(interaction))
+        embed.set_author(name=player["character_name"], icon_url=interaction.user.display_avatar.url)
+        embed.add_field(name="No available items to craft.", value="", inline=False)
+
+    view = View(timeout=None)
+    if page_count > 1:
+        view.add_item(CraftsPageButton("prev", interaction.user.id, craft_type, max(page - 1, 0), disabled=page == 0))
+        view.add_item(CraftsPageButton("next", interaction.user.id, craft_type, min(page + 1, page_count - 1),
+                                       disabled=page == page_count - 1))
+    view.add_item(CraftsPageButton("close", interaction.user.id, craft_type, page))
+    return embed, view
+
+
+@traced("render.create_embeds")
+async def create_embeds(interaction,title, items, player, items_per_embed=ITEMS_PER_PAGE):
     embeds = []
-    db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-    db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-    player = await db.get_player(db_unique_player_id,db_unique_server_id)
     for i in range(0, len(items), items_per_embed):
         embed = Embed(title=title, color=await utils.get_role_color(interaction))
         embed.set_author(name=f"{player['character_name']}'s Inventory")
@@ -164,4 +247,5 @@ async def create_embeds(interaction,title, items, items_per_embed=4):
 
 
 async def setup(bot: commands.Bot) -> None:
+    bot.add_dynamic_items(CraftsPageButton)
     await bot.add_cog(AvailableCrafts(bot))
\ No newline at end of file
@@ -1,10 +1,13 @@
 import discord
+import asyncio
 import os
 
 from discord.ext import commands
 from dotenv import load_dotenv
 
 from db import db
+from startup import phase
+from tracing import TracedCommandTree, install_http_spans
 
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
@@ -13,24 +16,26 @@ intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
 
+EXTENSIONS = (
+    'dm_commands', 'player_commands', 'available_crafts', 'crafting', 'lookup',
+    'admin', 'how-to', 'register', 'deregister', 'guild_events'
+)
+
 
 class Bot(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix=".", intents=intents)
+        super().__init__(command_prefix=".", intents=intents, tree_cls=TracedCommandTree)
 
     async def setup_hook(self):
-        await db.connect()
-        await db.init_utils()
-        await self.load_extension('dm_commands')
-        await self.load_extension('player_commands')
-        await self.load_extension('available_crafts')
-        await self.load_extension('crafting')
-        await self.load_extension('lookup')
-        await self.load_extension('admin')
-        await self.load_extension('how-to')
-        await self.load_extension('register')
-        await self.load_extension('deregister')
-        await self.load_extension('guild_events')
+        install_http_spans()
+        with phase("startup"):
+            with phase("db connect"):
+                await db.connect()
+            with phase("catalog"):
+                await db.init_utils()
+            with phase("extensions"):
+                await asyncio.gather(*(self.load_extension(extension) for extension in EXTENSIONS))
+        print(f"[Startup] Catalog booted from {db.catalog_source}")
 
     async def on_ready(self):
         print(f"Logged in as {self.user}!")
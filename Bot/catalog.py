@@ -0,0 +1,324 @@
+"""In-memory indexes over the static recipe tables"""
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+
+class RecipeCatalog:
+    """Holds every medicine and alchemical item recipe keyed by sanitized name and by id"""
+
+    def __init__(self, medicines, alchemical_items, medicine_recipe_rows, alchemy_recipe_rows):
+        self.medicines, self.medicines_by_id = self._index(medicines, medicine_recipe_rows)
+        self.alchemy, self.alchemy_by_id = self._index(alchemical_items, alchemy_recipe_rows)
+        self.medicine_requirements = self._requirements(self.medicines)
+        self.alchemy_requirements = self._requirements(self.alchemy)
+        self._matrices = {}
+
+    @staticmethod
+    def _index(items, recipe_rows):
+        grouped = defaultdict(lambda: defaultdict(list))
+        for row in recipe_rows:
+            grouped[row["recipe"]][row["component_number"]].append(dict(row))
+
+        by_name = {}
+        for item in items:
+            entry = dict(item)
+            entry["recipe"] = list(grouped[item["name"]].values())
+            by_name[item["name"]] = entry
+
+        by_id = {entry["id"]: entry for entry in by_name.values()}
+        return by_name, by_id
+
+    @staticmethod
+    def _requirements(entries):
+        # Each group is satisfied by any mix of its components, so only the group's ids and its largest
+        # per-component quantity matter when counting how many times a recipe can be crafted
+        requirements = {}
+        for name, entry in entries.items():
+            if entry["recipe"]:
+                requirements[name] = tuple(
+                    (tuple(component["id"] for component in group), max(component["quantity"] for component in group))
+                    for group in entry["recipe"]
+                )
+        return requirements
+
+    @staticmethod
+    def max_crafts(requirements, inventory: dict[int, int]) -> int:
+        """Returns how many times a recipe's requirements can be met from {component_id: quantity}"""
+        crafts = None
+        for component_ids, quantity in requirements:
+            group_crafts = sum(inventory.get(component_id, 0) for component_id in component_ids) // quantity
+            if crafts is None or group_crafts < crafts:
+                crafts = group_crafts
+                if crafts == 0:
+                    return 0
+        return crafts or 0
+
+    def possible_crafts(self, craft_type: str, inventory: dict[int, int]) -> list[dict[str, any]]:
+        """Returns every recipe craftable from {component_id: quantity} with its max_crafts"""
+        if craft_type == "Medicine":
+            entries, requirements = self.medicines, self.medicine_requirements
+        elif craft_type == "Alchemy":
+            entries, requirements = self.alchemy, self.alchemy_requirements
+        else:
+            return []
+
+        possible = []
+        for name, groups in requirements.items():
+            crafts = self.max_crafts(groups, inventory)
+            if crafts > 0:
+                possible.append({**entries[name], "max_crafts": crafts})
+        return possible
+
+    def craft_matrix(self, craft_type: str) -> "CraftMatrix":
+        if craft_type not in self._matrices:
+            requirements = self.medicine_requirements if craft_type == "Medicine" else self.alchemy_requirements
+            self._matrices[craft_type] = CraftMatrix(requirements)
+        return self._matrices[craft_type]
+
+    def party_crafts(self, craft_type: str, inventories: list[dict[int, int]]) -> list[list[dict[str, any]]]:
+        """Returns the craftable recipes for each {component_id: quantity} inventory, evaluated in one pass"""
+        entries = self._table(craft_type)
+        matrix = self.craft_matrix(craft_type)
+        crafts = matrix.max_crafts(matrix.inventory_matrix(inventories))
+
+        party = []
+        for player_crafts in crafts:
+            party.append([
+                {**entries[matrix.names[idx]], "max_crafts": int(player_crafts[idx])}
+                for idx in np.flatnonzero(player_crafts > 0)
+            ])
+        return party
+
+    def _table(self, craft_type: str) -> dict:
+        if craft_type == "Medicine":
+            return self.medicines
+        if craft_type == "Alchemy":
+            return self.alchemy
+        return {}
+
+    def get(self, craft_type: str, name: str) -> dict:
+        """Returns the catalog entry for a sanitized recipe name, or {} if there isn't one"""
+        return self._table(craft_type).get(name, {})
+
+    def get_by_id(self, craft_type: str, recipe_id: int) -> dict:
+        if craft_type == "Medicine":
+            return self.medicines_by_id.get(recipe_id, {})
+        if craft_type == "Alchemy":
+            return self.alchemy_by_id.get(recipe_id, {})
+        return {}
+
+
+class CraftMatrix:
+    """Recipe x component requirements laid out for evaluating many inventories at once"""
+
+    def __init__(self, requirements):
+        self.names = list(requirements)
+        component_ids = sorted({
+            component_id
+            for groups in requirements.values()
+            for group_ids, _ in groups
+            for component_id in group_ids
+        })
+        self.columns = {component_id: idx for idx, component_id in enumerate(component_ids)}
+
+        # One row per recipe group; a recipe's groups are contiguous and start at its offset
+        membership = []
+        quantities = []
+        offsets = []
+        for name in self.names:
+            offsets.append(len(quantities))
+            for group_ids, quantity in requirements[name]:
+                row = np.zeros(len(component_ids), dtype=np.int64)
+                # A component listed twice in a group counts twice, as it does in the recipe query
+                np.add.at(row, [self.columns[component_id] for component_id in group_ids], 1)
+                membership.append(row)
+                quantities.append(quantity)
+
+        # Stored as floats so the group sums go through BLAS; integer matmul has no BLAS path and is many times
+        # slower, and float64 sums of inventory quantities stay exact far beyond any real inventory
+        self.membership = np.array(membership, dtype=np.float64).reshape(len(quantities), len(component_ids))
+        self.quantities = np.array(quantities, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.intp)
+
+    def inventory_matrix(self, inventories: list[dict[int, int]]) -> np.ndarray:
+        """Builds a player x component quantity matrix, ignoring components no recipe uses"""
+        matrix = np.zeros((len(inventories), len(self.columns)), dtype=np.float64)
+        for row, inventory in enumerate(inventories):
+            for component_id, quantity in inventory.items():
+                column = self.columns.get(component_id)
+                if column is not None:
+                    matrix[row, column] += quantity
+        return matrix
+
+    def max_crafts(self, inventory_matrix: np.ndarray) -> np.ndarray:
+        """Returns a player x recipe matrix of how many times each recipe can be crafted"""
+        if not self.names or not len(inventory_matrix):
+            return np.zeros((len(inventory_matrix), len(self.names)), dtype=np.int64)
+        group_totals = (inventory_matrix @ self.membership.T).astype(np.int64)
+        group_crafts = group_totals // self.quantities
+        return np.minimum.reduceat(group_crafts, self.offsets, axis=1)
+
+
+class ComponentDossier:
+    """Everything /lookup component shows for each component, keyed by sanitized name"""
+
+    def __init__(self, components, source_rows, catalog: RecipeCatalog):
+        self.dossiers = {
+            component["name"]: {"component": dict(component), "sources": [], "medicines": [], "alchemy": [], "boosts": []}
+            for component in components
+        }
+        by_id = {dossier["component"]["id"]: dossier for dossier in self.dossiers.values()}
+
+        for row in source_rows:
+            if row["component_id"] in by_id:
+                by_id[row["component_id"]]["sources"].append(dict(row))
+
+        # Each recipe is listed once per component no matter how many groups it appears in
+        for key, entries in (("medicines", catalog.medicines), ("alchemy", catalog.alchemy)):
+            for entry in entries.values():
+                used = {component["id"] for group in entry["recipe"] for component in group}
+                for component_id in used:
+                    if component_id in by_id:
+                        by_id[component_id][key].append(entry["display_name"])
+
+        for medicine in catalog.medicines.values():
+            if medicine.get("boost") in self.dossiers:
+                self.dossiers[medicine["boost"]]["boosts"].append(medicine["display_name"])
+
+    def get(self, name: str) -> dict:
+        return self.dossiers.get(name, {})
+
+
+class PrefixIndex:
+    """Case-insensitive prefix search over a fixed set of names"""
+
+    def __init__(self, names):
+        self.keys = sorted({(name.casefold(), name) for name in names})
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Builds an index over (folded key, name) pairs, so a name can be found by more than its own start"""
+        index = cls(())
+        index.keys = sorted(set(keys))
+        return index
+
+    def search(self, prefix: str, limit: int = 25) -> list[str]:
+        key = prefix.casefold()
+        matches = []
+        idx = bisect_left(self.keys, (key,))
+        while idx < len(self.keys) and len(matches) < limit and self.keys[idx][0].startswith(key):
+            if self.keys[idx][1] not in matches:
+                matches.append(self.keys[idx][1])
+            idx += 1
+        return matches
+
+
+class SearchIndex:
+    """Ranked name search across catalog kinds: prefix, then word start, then substring, then trigram similarity"""
+
+    def __init__(self, names_by_kind: dict[str, list[str]]):
+        self.prefixes = {kind: PrefixIndex(names) for kind, names in names_by_kind.items()}
+        # Every name keyed by the rest of it from each later word, so word starts are a prefix search too
+        self.word_starts = {
+            kind: PrefixIndex.from_keys(
+                (folded[idx + 1:], name)
+                for folded, name in prefix_index.keys
+                for idx, char in enumerate(folded) if char == " ")
+            for kind, prefix_index in self.prefixes.items()
+        }
+        self.entries = []
+        self.trigrams = defaultdict(list)
+        for kind, prefix_index in self.prefixes.items():
+            for folded, name in prefix_index.keys:
+                for trigram in self._trigrams(folded):
+                    self.trigrams[trigram].append(len(self.entries))
+                self.entries.append((kind, name, folded))
+
+    @staticmethod
+    def _trigrams(text: str) -> set[str]:
+        return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+    def search(self, query: str, kinds: tuple[str, ...] = None, limit: int = 25) -> list[tuple[str, str]]:
+        """Returns up to limit (kind, name) pairs, best matches first"""
+        key = query.casefold().strip()
+        kinds = kinds or tuple(self.prefixes)
+
+        ranked = {}
+        for kind in kinds:
+            for name in self.prefixes[kind].search(key, limit):
+                ranked[(kind, name)] = (0, 0.0, name)
+
+        if key and len(ranked) < limit:
+            for kind in kinds:
+                for name in self.word_starts[kind].search(key, limit):
+                    ranked.setdefault((kind, name), (1, 0.0, name))
+
+        # Queries shorter than a trigram stop at prefix and word-start matches, both bounded by limit
+        query_trigrams = self._trigrams(key)
+        if query_trigrams and len(ranked) < limit:
+            shared = defaultdict(int)
+            for trigram in query_trigrams:
+                for idx in self.trigrams.get(trigram, ()):
+                    shared[idx] += 1
+
+            for idx, count in shared.items():
+                kind, name, folded = self.entries[idx]
+                if kind not in kinds or (kind, name) in ranked:
+                    continue
+                if key in folded:
+                    ranked[(kind, name)] = (2, 0.0, name)
+                elif count / len(query_trigrams) >= 0.4:
+                    ranked[(kind, name)] = (3, -count / len(query_trigrams), name)
+
+        return sorted(ranked, key=ranked.get)[:limit]
+
+    def names(self, query: str, kind: str, limit: int = 25) -> list[str]:
+        return [name for _, name in self.search(query, (kind,), limit)]
+
+
+class CreatureIndex:
+    """Creatures grouped by creature_base, with their harvestable components"""
+
+    def __init__(self, creatures, component_rows):
+        self.bases = defaultdict(dict)
+        for creature in creatures:
+            self.bases[creature["creature_base"]][creature["creature_name"]] = dict(creature)
+        self.prefixes = {base: PrefixIndex(names) for base, names in self.bases.items()}
+
+        self.components = defaultdict(list)
+        for row in component_rows:
+            self.components[(row["creature_base"], row["creature_name"])].append(dict(row))
+
+    def search(self, base: str, prefix: str, limit: int = 25) -> list[str]:
+        if base not in self.prefixes:
+            return []
+        return self.prefixes[base].search(prefix, limit)
+
+    def get(self, base: str, name: str) -> dict:
+        return self.bases.get(base, {}).get(name, {})
+
+    def get_by_base(self, base: str) -> list[dict]:
+        return list(self.bases.get(base, {}).values())
+
+    def get_components(self, base: str, name: str) -> list[dict]:
+        return self.components.get((base, name), [])
+
+
+class ComponentIndex:
+    """Looks up a component record by display name, sanitized name or id"""
+
+    def __init__(self, components):
+        self.by_id = {component["id"]: dict(component) for component in components}
+        self.by_name = {component["name"]: component for component in self.by_id.values()}
+        self.by_display_name = {component["display_name"]: component for component in self.by_id.values()}
+
+    def get_by_display_name(self, display_name: str) -> dict:
+        return self.by_display_name.get(display_name)
+
+    def get_by_name(self, name: str) -> dict:
+        return self.by_name.get(name)
+
+    def get_by_id(self, component_id: int) -> dict:
+        return self.by_id.get(component_id)
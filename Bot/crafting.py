@@ -3,21 +3,109 @@ import utils
 
 from discord import app_commands, Embed, ButtonStyle, SelectOption
 from discord.ext import commands
-from discord.ui import Button, View, Select
+from discord.ui import Button, DynamicItem, Select, View
 
 from db import db
+from tracing import traced
+from views import PERSISTENT_VIEWS, CRAFT_TYPE_CODES, CRAFT_TYPES, TrackedView, view_registry
+
+def spare_components(swappable_components, singular_components):
+    """Takes the units the fixed ingredients use out of each held quantity, so they can't be picked as well"""
+    fixed = {}
+    for component in singular_components:
+        fixed[component[0]['id']] = fixed.get(component[0]['id'], 0) + 1
+    return tuple((component, max(0, available - fixed.get(component['id'], 0))) for component, available in swappable_components)
+
+
+def component_options(swappable_components, picks=None, max_choices=None):
+    """Options for the swappable ingredient menu, at most 25
+
+    Every component gets a single option first, then x2, x3 and so on while there is room, so several of one component
+    take one pick. Each option's value is "<component_id>x<count>".
+    """
+    picked = dict(picks or ())
+    remaining = None if max_choices is None else max_choices - sum(picked.values())
+    caps = []
+    for component, available in swappable_components[:25]:
+        left = available - picked.get(component['id'], 0)
+        caps.append(max(1, left if remaining is None else min(left, remaining)))
+
+    counts = [0] * len(caps)
+    room = 25
+    while room and any(count < cap for count, cap in zip(counts, caps)):
+        for index, cap in enumerate(caps):
+            if room and counts[index] < cap:
+                counts[index] += 1
+                room -= 1
+
+    options = []
+    for (component, available), top in zip(swappable_components, counts):
+        count = picked.get(component['id'], 0)
+        description = f"{available - count} of {available} left" + (f", {count} picked" if count else "")
+        for quantity in range(1, top + 1):
+            options.append(SelectOption(
+                label=component['display_name'] if quantity == 1 else f"{component['display_name']} x{quantity}",
+                value=f"{component['id']}x{quantity}",
+                description=description))
+    return options
+
+
+def pick_limits(minquantity, maxquantity):
+    """Returns (min_choices, max_choices, placeholder) for a recipe's swappable ingredient menu"""
+    min_choices = minquantity-1 if maxquantity else minquantity
+    max_choices = maxquantity if maxquantity else minquantity
+    placeholder = f"Required Choices: {minquantity}" if not maxquantity else f"Optional Medicine Strength Boost: {minquantity-1}-{maxquantity}"
+    return min_choices, max_choices, placeholder
+
+
+def pick_values(picks, min_choices, max_choices, option_count):
+    """Returns (min_values, max_values) for the next selection, given the (component_id, count) pairs picked so far"""
+    remaining = max_choices - sum(count for _, count in picks or ())
+    min_values = 0 if picks is None and not min_choices else 1
+    return min_values, max(1, min(remaining, option_count))
+
+
+def parse_pick(value) -> tuple[int, int]:
+    component_id, count = value.split("x")
+    return int(component_id), int(count)
+
+
+def add_picks(picks, values, swappable_components, max_choices):
+    """Adds the selected (component, count) options to the picks so far, or returns None if that is more than allowed
+    or spare
+
+    swappable_components holds what is spare after the fixed ingredients, see spare_components.
+    """
+    held = {component['id']: available for component, available in swappable_components}
+    counts = dict(picks or ())
+    for value in values:
+        component_id, count = parse_pick(value)
+        counts[component_id] = counts.get(component_id, 0) + count
+        if counts[component_id] > held.get(component_id, 0):
+            return None
+
+    if sum(counts.values()) > max_choices:
+        return None
+    return list(counts.items())
+
 
 class ComponentSelectMenu(Select):
     def __init__(self, swappable_components, minquantity, maxquantity):
-        options = [
-            SelectOption(label=component['display_name'], value=f"{component['display_name']}_{idx + 1}")
-            for idx, component in enumerate(swappable_components)
-        ]
-        placeholder = f"Required Choices: {minquantity}" if not maxquantity else f"Optional Medicine Strength Boost: {minquantity-1}-{maxquantity}"
-        super().__init__(placeholder=placeholder,
-                         min_values=minquantity-1 if maxquantity else minquantity,
-                         max_values=maxquantity if maxquantity else minquantity,
-                         options=options)
+        self.min_choices, self.max_choices, placeholder = pick_limits(minquantity, maxquantity)
+        self.swappable_components = swappable_components
+        self.picks = None
+        options = component_options(swappable_components, max_choices=self.max_choices)
+        min_values, max_values = pick_values(self.picks, self.min_choices, self.max_choices, len(options))
+        super().__init__(placeholder=placeholder, min_values=min_values, max_values=max_values, options=options)
+
+    def reset(self):
+        self.picks = None
+        self.options = component_options(self.swappable_components, max_choices=self.max_choices)
+        self.min_values, self.max_values = pick_values(self.picks, self.min_choices, self.max_choices, len(self.options))
+        self.disabled = False
+
+    def picked_total(self) -> int:
+        return sum(count for _, count in self.picks or ())
 
     async def callback(self, interaction):
         if interaction.user.id != self.view.author_id:
@@ -25,24 +113,27 @@ class ComponentSelectMenu(Select):
                 f"Hands off {str(interaction.user.global_name)}! This isn't your dropdown!")
             return
 
-        selected_options = [option for option in self.options if option.value in self.values]
-
-        if selected_options is None:
-            await interaction.response.send_message("No valid components were selected.", ephemeral=True)
+        picks = add_picks(self.picks, self.values, self.swappable_components, self.max_choices)
+        if picks is None:
+            await interaction.response.send_message(
+                f"Pick up to {self.max_choices} ingredients in total, and no more of a component than you can spare.",
+                ephemeral=True)
             return
+        self.picks = picks
 
-        if len(self.options) == 0:
-            self.options = [SelectOption(label="Empty", value="Empty")]
-
-        for selected_option in selected_options:
-            self.view.chosen_components.append(selected_option.label)
+        names = {component['id']: component['display_name'] for component, _ in self.view.swappable_components}
+        for value in self.values:
+            component_id, count = parse_pick(value)
+            self.view.chosen_components.extend([names[component_id]] * count)
             if hasattr(self.view, "maxquantity"):
-                self.view.strength = "★ "+ self.view.strength
+                self.view.strength = "★ " * count + self.view.strength
 
         if hasattr(self.view, "current_rank_stat"):
-            self.view.current_rank_stat = self.view.rank_stats[len(selected_options)]
+            self.view.current_rank_stat = self.view.rank_stats[self.picked_total()]
 
-        self.disabled = True
+        self.options = component_options(self.swappable_components, self.picks, self.max_choices)
+        self.min_values, self.max_values = pick_values(self.picks, self.min_choices, self.max_choices, len(self.options))
+        self.disabled = self.picked_total() >= self.max_choices
 
         embed = await build_content_block(
             craft_type=self.view.craft_type,
@@ -75,40 +166,36 @@ class CraftConfirm(Button):
                 f"Don't click other peoples buttons {str(interaction.user.global_name)}!")
             return
 
-        final_components = []
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        player = await db.get_player(db_unique_player_id, db_unique_server_id)
-        player_inventory = await db.get_player_inventory(db_unique_player_id)
+        for item in self.view.children:
+            if isinstance(item, ComponentSelectMenu):
+                if item.picks is None or item.picked_total() < item.min_choices:
+                    await interaction.response.send_message("Please select your ingredients.", ephemeral=True)
+                    return
 
+        final_components = {}
+        component_names = {}
         for component in self.view.singular_components:
-            final_components.append(component[0]['display_name'])
+            final_components[component[0]['id']] = final_components.get(component[0]['id'], 0) + 1
+            component_names[component[0]['id']] = component[0]['display_name']
 
         if self.view.swappable:
+            swappable_ids = {component['display_name']: component['id'] for component, _ in self.view.swappable_components}
             for component in self.view.chosen_components:
-                final_components.append(component)
-
-        for component in final_components:
-
-            _, amount = await utils.check_inventory(player_inventory, component)
-            if amount - 1 <= 0:
-                await db.delete_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component))
-            else:
-                await db.sub_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component), 1)
+                final_components[swappable_ids[component]] = final_components.get(swappable_ids[component], 0) + 1
+                component_names[swappable_ids[component]] = component
 
         if hasattr(self.view, "selected_boosts"):
             if self.view.selected_boosts > 0:
-                _, amount = await utils.check_inventory(player_inventory, self.view.boost_type)
-                if amount - self.view.selected_boosts <= 0:
-                    await db.delete_player_inventory_item(db_unique_player_id, await utils.sanitize_input(self.view.boost_type))
-                else:
-                    await db.sub_player_inventory_item(db_unique_player_id, await utils.sanitize_input(self.view.boost_type), self.view.selected_boosts)
+                boost_id = db.component_index.get_by_display_name(self.view.boost_type)['id']
+                final_components[boost_id] = final_components.get(boost_id, 0) + self.view.selected_boosts
+                component_names[boost_id] = self.view.boost_type
 
-        for item in self.view.children:
-            if isinstance(item, ComponentSelectMenu):
-                if not item.disabled:
-                    await interaction.response.send_message("Please select your ingredients.", ephemeral=True)
-                    return
+        crafted, shortfall = await db.consume_recipe(self.view.player_id, final_components)
+        if not crafted:
+            missing = ", ".join(component_names[item['component_id']] for item in shortfall)
+            await interaction.response.send_message(
+                f"You no longer have enough {missing} to craft {self.view.item_name}.", ephemeral=True)
+            return
 
         embed = await build_content_block(
             craft_type=self.view.craft_type,
@@ -129,7 +216,7 @@ class CraftConfirm(Button):
             final_craft=True
         )
 
-        embed.set_author(name=f"{player['character_name']} successfully crafted:", icon_url=interaction.user.display_avatar.url)
+        embed.set_author(name=f"{self.view.character_name} successfully crafted:", icon_url=interaction.user.display_avatar.url)
         embed.set_footer(text="Remember to add it to your inventory!")
 
         await interaction.response.edit_message(embed=embed, view=None)
@@ -152,11 +239,7 @@ class ComponentReset(Button):
 
         for item in self.view.children:
             if isinstance(item, ComponentSelectMenu):
-                item.disabled = False
-                item.options = [
-                    SelectOption(label=component['display_name'], value=f"{component['display_name']}_{idx + 1}")
-                    for idx, component in enumerate(self.view.swappable_components)
-                ]
+                item.reset()
             if isinstance(item, Boost):
                 item.disabled = False
 
@@ -273,12 +356,14 @@ class CraftCancel(Button):
         await interaction.delete_original_response()
 
 
-class CraftingView(View):
+class CraftingView(TrackedView):
     def __init__(self, singular_components, swappable_components, item_name, strength, swappable, craft_type,
-                 boosts_available, selected_boosts, boost_stats, ranked, author_id):
+                 boosts_available, selected_boosts, boost_stats, ranked, author_id, player_id, character_name):
         super().__init__()
 
         self.author_id = author_id
+        self.player_id = player_id
+        self.character_name = character_name
         self.swappable = swappable
         self.chosen_components = []
         self.singular_components = singular_components
@@ -309,9 +394,9 @@ class CraftingView(View):
             self.current_rank_stat = ranked[1]
 
         if swappable:
-            self.minquantity = swappable_components[0]['quantity']
+            self.minquantity = swappable_components[0][0]['quantity']
             if craft_type == "Medicine":
-                self.maxquantity = swappable_components[0]['rank_quantity']
+                self.maxquantity = swappable_components[0][0]['rank_quantity']
             self.add_item(ComponentSelectMenu(
                 swappable_components=swappable_components,
                 minquantity=self.minquantity,
@@ -328,10 +413,295 @@ class CraftingView(View):
         self.add_item(CraftCancel(label="Cancel"))
 
 
+# Discord rejects a custom_id over 100 characters. Numbers in the craft state are base 36 and a pick's count is only
+# written when it is above one, which keeps even a full set of picks well inside the limit; CraftSession.fits checks.
+CUSTOM_ID_LIMIT = 100
+CRAFT_STATE = r"(?P<author_id>[0-9a-z]+):(?P<craft_type>[MA]):(?P<recipe_id>[0-9a-z]+):(?P<boosts>\d+):(?P<picks>-|c[0-9a-z_.]*)"
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def base36(number: int) -> str:
+    text = ""
+    while True:
+        number, digit = divmod(number, 36)
+        text = DIGITS[digit] + text
+        if not number:
+            return text
+
+
+def encode_picks(picks) -> str:
+    if picks is None:
+        return "-"
+    return "c" + ".".join(base36(component_id) + (f"_{count}" if count > 1 else "") for component_id, count in picks)
+
+
+def decode_picks(text: str):
+    if text == "-":
+        return None
+    picks = []
+    for pick in text[1:].split("."):
+        if pick:
+            component_id, _, count = pick.partition("_")
+            picks.append((int(component_id, 36), int(count or 1)))
+    return picks
+
+
+def display_strength(strength):
+    if strength == "★ ★ – ★ ★ ★ ★ ★":
+        return "★ ★"
+    if strength == "★ ☆ – ★ ★ ★ ★ ☆":
+        return "★ ☆"
+    return strength
+
+
+class CraftSession:
+    """A /craft message's state, rebuilt on every interaction from its custom_id and the player's inventory"""
+
+    def __init__(self, author_id, player_id, character_name, craft_type, craft_item, player_inventory, picks=None, boosts=0):
+        self.author_id = author_id
+        self.player_id = player_id
+        self.character_name = character_name
+        self.craft_type = craft_type
+        self.craft_item = craft_item
+        self.item_name = craft_item['display_name']
+        self.picks = picks
+        self.singular_components = []
+        self.swappable_components = None
+        self.swappable = False
+        self.maxquantity = None
+        self.error = None
+
+        self.boost_type = craft_item.get('boost') if craft_type == "Medicine" else None
+        self.boostable = bool(self.boost_type)
+        self.boosts_total = min(player_inventory.quantity_by_display_name(self.boost_type), craft_item['boost_amt']) if self.boostable else 0
+        self.boosts = min(boosts, self.boosts_total)
+
+        rank_values = craft_item.get('rank_values') if craft_type == "Medicine" else None
+        self.ranked = rank_values.split(",") if rank_values else None
+
+    @classmethod
+    async def create(cls, author_id, player_id, character_name, craft_type, craft_item, player_inventory, picks=None, boosts=0):
+        session = cls(author_id, player_id, character_name, craft_type, craft_item, player_inventory, picks, boosts)
+        session.singular_components, swappable_ingredients, session.swappable, session.error = await utils.split_ingredients(craft_item['recipe'])
+        if session.swappable:
+            session.swappable_components = spare_components(
+                await utils.find_available_ingredients(player_inventory, swappable_ingredients), session.singular_components)
+            minquantity = swappable_ingredients[0]['quantity']
+            session.maxquantity = swappable_ingredients[0]['rank_quantity'] if craft_type == "Medicine" else None
+            session.min_choices, session.max_choices, session.placeholder = pick_limits(minquantity, session.maxquantity)
+        return session
+
+    @classmethod
+    async def load(cls, interaction, state):
+        """Rebuilds the session for the interacting player, or returns None if they can no longer craft the recipe"""
+        craft_type = CRAFT_TYPES[state["craft_type"]]
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
+        can_craft, player_inventory, craft_item = await db.can_craft(db_unique_player_id, craft_type, int(state["recipe_id"], 36))
+        if not can_craft:
+            return None
+        return await cls.create(interaction.user.id, db_unique_player_id, player['character_name'], craft_type, craft_item,
+                                player_inventory, decode_picks(state["picks"]), int(state["boosts"]))
+
+    def custom_id(self, action: str, boosts=None, picks=None) -> str:
+        boosts = self.boosts if boosts is None else boosts
+        picks = self.picks if picks is None else picks
+        return (f"cr:{action}:{base36(self.author_id)}:{CRAFT_TYPE_CODES[self.craft_type]}:{base36(self.craft_item['id'])}:"
+                f"{boosts}:{encode_picks(picks)}")
+
+    def fits(self) -> bool:
+        """Whether every custom_id stays within Discord's limit however the picks and boosts end up"""
+        picks = None
+        if self.swappable:
+            # The most picks the menu can add up to, spread over the components with the longest ids
+            longest = sorted((component['id'] for component, _ in self.swappable_components),
+                             key=lambda component_id: len(base36(component_id)), reverse=True)
+            picks = [(component_id, self.max_choices) for component_id in longest[:self.max_choices]]
+        return len(self.custom_id("confirm", self.boosts_total, picks)) <= CUSTOM_ID_LIMIT
+
+    def picked_total(self) -> int:
+        return sum(count for _, count in self.picks) if self.picks else 0
+
+    def chosen_names(self) -> list[str]:
+        chosen = []
+        for component_id, count in self.picks or ():
+            chosen.extend([db.component_index.get_by_id(component_id)['display_name']] * count)
+        return chosen
+
+    def strength(self) -> str:
+        strength = display_strength(self.craft_item.get('strength'))
+        if self.swappable and self.maxquantity:
+            strength = "★ " * self.picked_total() + strength
+        for _ in range(self.boosts):
+            if '☆' in strength:
+                strength = strength.replace('☆', '★', 1)
+            elif '✧' in strength:
+                strength = strength.replace('✧', '✦', 1)
+        return strength
+
+    def duration(self):
+        duration = self.craft_item.get('duration') if self.craft_type == "Medicine" else None
+        if self.boost_type == "Alchemilla":
+            for _ in range(self.boosts):
+                duration = Boost.extend_duration(duration, self.craft_item['can_infinite'])
+        return duration
+
+    def dice(self):
+        dice = self.craft_item.get('dice') if self.craft_type == "Medicine" else None
+        if self.boost_type == "Ephedra" and self.boosts:
+            dice = Boost.increase_dice(dice, self.boosts)
+        return dice
+
+    def rank_stat(self):
+        if not self.ranked:
+            return None
+        return self.ranked[1:][self.picked_total()] if self.picks is not None else self.ranked[1]
+
+    def requirements(self) -> tuple[dict[int, int], dict[int, str]]:
+        """Returns {component_id: quantity} to consume and the display name of each component"""
+        final_components = {}
+        component_names = {}
+        for component in self.singular_components:
+            final_components[component[0]['id']] = final_components.get(component[0]['id'], 0) + 1
+            component_names[component[0]['id']] = component[0]['display_name']
+
+        for component_id, count in self.picks or ():
+            final_components[component_id] = final_components.get(component_id, 0) + count
+            component_names[component_id] = db.component_index.get_by_id(component_id)['display_name']
+
+        if self.boosts > 0:
+            boost_id = db.component_index.get_by_display_name(self.boost_type)['id']
+            final_components[boost_id] = final_components.get(boost_id, 0) + self.boosts
+            component_names[boost_id] = self.boost_type
+        return final_components, component_names
+
+    async def embed(self, color, final_craft=False) -> Embed:
+        return await build_content_block(
+            craft_type=self.craft_type,
+            item_name=self.item_name,
+            strength=self.strength(),
+            singular_ingredients=self.singular_components,
+            swappable_ingredients=self.swappable_components,
+            chosen_ingredients=self.chosen_names(),
+            boostable=self.boostable,
+            boosts_available=self.boosts_total if final_craft else self.boosts_total - self.boosts,
+            selected_boosts=self.boosts,
+            boost_type=self.boost_type,
+            duration=self.duration(),
+            dice=self.dice(),
+            color=color,
+            rank_title=self.ranked[0] if self.ranked else None,
+            rank_stats=self.rank_stat(),
+            final_craft=final_craft
+        )
+
+    def view(self) -> View:
+        view = View(timeout=None)
+        if self.swappable:
+            options = component_options(self.swappable_components, self.picks, self.max_choices)
+            min_values, max_values = pick_values(self.picks, self.min_choices, self.max_choices, len(options))
+            view.add_item(CraftSelect(Select(
+                custom_id=self.custom_id("pick"),
+                placeholder=self.placeholder,
+                min_values=min_values,
+                max_values=max_values,
+                options=options,
+                disabled=self.picked_total() >= self.max_choices)))
+        view.add_item(CraftButton(Button(label="Confirm", style=ButtonStyle.green, custom_id=self.custom_id("confirm"))))
+        if self.swappable:
+            view.add_item(CraftButton(Button(label="Reset", style=ButtonStyle.primary, custom_id=self.custom_id("reset"))))
+        if self.craft_type == "Medicine" and self.boostable:
+            view.add_item(CraftButton(Button(
+                label="Boost", style=ButtonStyle.secondary, emoji='🔥', custom_id=self.custom_id("boost"),
+                disabled=self.boosts >= self.boosts_total)))
+        view.add_item(CraftButton(Button(label="Cancel", style=ButtonStyle.red, custom_id=self.custom_id("cancel"))))
+        return view
+
+
+async def handle_craft_action(interaction, state, values=None):
+    """Applies a /craft button or selection to the session encoded in its custom_id"""
+    if interaction.user.id != int(state["author_id"], 36):
+        await interaction.response.send_message(
+            f"Don't click other people buttons {str(interaction.user.global_name)}!", ephemeral=True)
+        return
+
+    if state["action"] == "cancel":
+        await interaction.response.defer()
+        await interaction.delete_original_response()
+        return
+
+    session = await CraftSession.load(interaction, state)
+    if session is None:
+        await interaction.response.send_message("You no longer have the required components to craft this.", ephemeral=True)
+        return
+
+    if state["action"] == "pick":
+        picks = add_picks(session.picks, values, session.swappable_components, session.max_choices)
+        if picks is None:
+            await interaction.response.send_message(
+                f"Pick up to {session.max_choices} ingredients in total, and no more of a component than you can spare.",
+                ephemeral=True)
+            return
+        session.picks = picks
+    elif state["action"] == "reset":
+        session.picks = None
+        session.boosts = 0
+    elif state["action"] == "boost":
+        session.boosts = min(session.boosts + 1, session.boosts_total)
+    elif state["action"] == "confirm":
+        if session.swappable and (session.picks is None or session.picked_total() < session.min_choices):
+            await interaction.response.send_message("Please select your ingredients.", ephemeral=True)
+            return
+
+        final_components, component_names = session.requirements()
+        crafted, shortfall = await db.consume_recipe(session.player_id, final_components)
+        if not crafted:
+            missing = ", ".join(component_names[item['component_id']] for item in shortfall)
+            await interaction.response.send_message(
+                f"You no longer have enough {missing} to craft {session.item_name}.", ephemeral=True)
+            return
+
+        embed = await session.embed(await utils.get_role_color(interaction), final_craft=True)
+        embed.set_author(name=f"{session.character_name} successfully crafted:", icon_url=interaction.user.display_avatar.url)
+        embed.set_footer(text="Remember to add it to your inventory!")
+        await interaction.response.edit_message(embed=embed, view=None)
+        return
+
+    await interaction.response.edit_message(embed=await session.embed(await utils.get_role_color(interaction)), view=session.view())
+
+
+class CraftButton(DynamicItem[Button], template=r"cr:(?P<action>confirm|reset|boost|cancel):" + CRAFT_STATE):
+    def __init__(self, item, state=None):
+        super().__init__(item)
+        self.state = state
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(item, match.groupdict())
+
+    async def callback(self, interaction):
+        await handle_craft_action(interaction, self.state)
+
+
+class CraftSelect(DynamicItem[Select], template=r"cr:(?P<action>pick):" + CRAFT_STATE):
+    def __init__(self, item, state=None):
+        super().__init__(item)
+        self.state = state
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(item, match.groupdict())
+
+    async def callback(self, interaction):
+        await handle_craft_action(interaction, self.state, self.item.values)
+
+
 class Crafting(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(CraftButton, CraftSelect)
+
     @app_commands.command(
         name="craft",
         description="Craft an item!"
@@ -339,52 +709,52 @@ class Crafting(commands.Cog):
     @app_commands.autocomplete(item_name=utils.craft_recipe_autocompletion)
     @app_commands.autocomplete(craft_type=utils.type_autocompletion)
     async def craft(self, interaction, craft_type: str, item_name: str):
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
         stats = None
         ranked = None
 
-        if craft_type == "Medicine":
-            recipe = await db.get_medicine_recipe(await utils.sanitize_input(item_name))
-            can_craft = await db.player_can_craft_medicine(db_unique_player_id, await utils.sanitize_input(item_name))
-            strength = await db.get_medicine_strength(await utils.sanitize_input(item_name))
-        elif craft_type == "Alchemy":
-            recipe = await db.get_alchemy_recipe(await utils.sanitize_input(item_name))
-            can_craft = await db.player_can_craft_alchemy(db_unique_player_id, await utils.sanitize_input(item_name))
-            strength = await db.get_alchemy_strength(await utils.sanitize_input(item_name))
-        else:
+        if craft_type not in ("Medicine", "Alchemy"):
             await interaction.response.send_message("Please choose either Medicine or Alchemy.")
             return
 
-        if strength == "★ ★ – ★ ★ ★ ★ ★":
-            strength = "★ ★"
-        elif strength == "★ ☆ – ★ ★ ★ ★ ☆":
-            strength = "★ ☆"
-
-        if can_craft:
-            player_inventory = await db.get_player_inventory(db_unique_player_id)
+        recipe_id = db.catalog.get(craft_type, await utils.sanitize_input(item_name)).get('id')
+        can_craft, player_inventory, craft_item = await db.can_craft(db_unique_player_id, craft_type, recipe_id)
+        recipe = craft_item.get('recipe')
+        strength = display_strength(craft_item.get('strength'))
+
+        session = None
+        if can_craft and PERSISTENT_VIEWS:
+            session = await CraftSession.create(interaction.user.id, db_unique_player_id, player['character_name'],
+                                                craft_type, craft_item, player_inventory)
+            # A recipe whose state can't fit in a custom_id gets the in-memory view below instead
+            if not session.error and not session.fits():
+                session = None
+
+        if session:
+            if session.error:
+                await interaction.response.send_message(f"Error received: {session.error}")
+                return
+            await interaction.response.send_message(
+                embed=await session.embed(await utils.get_role_color(interaction)), view=session.view())
+        elif can_craft:
             singular_ingredients, swappable_ingredients, swappable, error = await utils.split_ingredients(recipe)
 
             if error:
                 await interaction.response.send_message(f"Error received: {error}")
                 return
-            available_ingredients = await utils.find_available_ingredients(player_inventory, swappable_ingredients) if swappable else None
+            available_ingredients = spare_components(
+                await utils.find_available_ingredients(player_inventory, swappable_ingredients), singular_ingredients) if swappable else None
 
             selected_boosts = 0
             boosts_available = 0
             boostable = False
             if craft_type == "Medicine":
-                stats = await db.get_medicine_stats(await utils.sanitize_input(item_name))
+                stats = [craft_item]
                 if stats:
                     if stats[0]['boost']:
                         boost_type = stats[0]['boost']
                         boostable = True
-                        for item in player_inventory:
-                            if item['display_name'] == boost_type:
-                                if item['quantity'] < stats[0]['boost_amt']:
-                                    boosts_available = item['quantity']
-                                else:
-                                    boosts_available = stats[0]['boost_amt']
+                        boosts_available = min(player_inventory.quantity_by_display_name(boost_type), stats[0]['boost_amt'])
                     if stats[0]['rank_values']:
                         ranked = stats[0]['rank_values'].split(",")
                         ranked = [i for i in ranked]
@@ -418,10 +788,13 @@ class Crafting(commands.Cog):
                 selected_boosts=selected_boosts,
                 boost_stats=stats if stats else None,
                 ranked=ranked if ranked else None,
-                author_id=interaction.user.id
+                author_id=interaction.user.id,
+                player_id=db_unique_player_id,
+                character_name=player['character_name']
             )
 
             await interaction.response.send_message(embed=embed, view=view)
+            await view_registry.register(view, interaction)
         else:
             await interaction.response.send_message(f"You do not have the required components to craft {item_name}.", ephemeral=True)
 
@@ -446,6 +819,7 @@ class Crafting(commands.Cog):
             await interaction.response.send_message(message, ephemeral=True)
 
 
+@traced("render.build_content_block")
 async def build_content_block(
         craft_type,
         item_name,
@@ -528,4 +902,5 @@ async def build_content_block(
 
 
 async def setup(bot: commands.Bot) -> None:
+    bot.add_dynamic_items(CraftButton, CraftSelect)
     await bot.add_cog(Crafting(bot))
\ No newline at end of file
@@ -1,44 +1,412 @@
+import gc
 import os
+import inspect
+import json
+import time
 import dotenv
+import asyncio
 import asyncpg
 import traceback
 from collections import defaultdict
 
+from instrumentation import DatabaseInstrumentation
+from migrations import ensure_inventory_key
+from inventory import Inventory
+from catalog import RecipeCatalog, ComponentDossier, SearchIndex, CreatureIndex, ComponentIndex
+from pool import InstrumentedPool, pool_config
+from snapshot import load_snapshot, save_snapshot
+from startup import phase
+
 dotenv.load_dotenv()
-DB_PASS = os.getenv("DB_PASS")
+SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT", "catalog.snapshot")
+
+# Every table the catalog is built from; a change to any of them changes the catalog version
+CATALOG_TABLES = (
+    "regions", "creatures", "components", "medicines", "alchemical_items", "medicine_recipes", "alchemical_recipes",
+    "creature_components", "region_components", "common_tables", "merchant_components"
+)
+SERVER_ID_SQL = "SELECT id FROM servers WHERE server_id = $1"
+PLAYER_ID_SQL = "SELECT id FROM players WHERE user_id = $1 AND server_id = $2"
+PLAYER_SQL = "SELECT * FROM players WHERE id = $1 AND server_id = $2;"
+PLAYER_INVENTORY_SQL = """
+    SELECT c.id, c.name, c.display_name, pi.component_quantity AS quantity
+    FROM players p
+    JOIN player_inventories pi ON p.id = pi.player_id
+    JOIN components c ON pi.component_id = c.id
+    WHERE p.id = $1;
+"""
+INVENTORY_QUANTITIES_SQL = "SELECT component_id, component_quantity FROM player_inventories WHERE player_id = $1;"
+# Applies a signed delta to one (player, component) row in a single statement. Positive deltas upsert through the
+# (player_id, component_id) unique index that migrations.py ensures at startup, so concurrent first writes can't
+# both insert. Negative deltas lock the row first and then either update it or, if it would drop below one, delete
+# it; no row is created for them.
+INVENTORY_DELTA_SQL = """
+    WITH locked AS (
+        SELECT component_quantity
+        FROM player_inventories
+        WHERE player_id = $1 AND component_id = $2 AND $3 < 0
+        FOR UPDATE
+    ),
+    removed AS (
+        DELETE FROM player_inventories
+        WHERE player_id = $1 AND component_id = $2 AND (SELECT component_quantity FROM locked) + $3 < 1
+        RETURNING 0 AS component_quantity
+    ),
+    updated AS (
+        UPDATE player_inventories
+        SET component_quantity = component_quantity + $3
+        WHERE player_id = $1 AND component_id = $2 AND (SELECT component_quantity FROM locked) + $3 >= 1
+        RETURNING component_quantity
+    ),
+    upserted AS (
+        INSERT INTO player_inventories (player_id, component_id, component_quantity)
+        SELECT $1, $2, $3
+        WHERE $3 > 0
+        ON CONFLICT (player_id, component_id)
+        DO UPDATE SET component_quantity = player_inventories.component_quantity + EXCLUDED.component_quantity
+        RETURNING component_quantity
+    )
+    SELECT component_quantity FROM removed
+    UNION ALL
+    SELECT component_quantity FROM updated
+    UNION ALL
+    SELECT component_quantity FROM upserted;
+"""
+# Removes every component of a craft in one statement, or nothing if the player falls short. The player's rows are
+# locked in component order first; every shortfall is returned and, when there is none, each row is decremented or,
+# if it would drop below one, deleted. Both writes are gated on the shortfall check, which reads every locked row,
+# so all locks are held before either touches a row.
+CONSUME_RECIPE_SQL = """
+    WITH wanted AS (
+        SELECT * FROM unnest($2::int[], $3::int[]) AS w(component_id, quantity)
+    ),
+    locked AS (
+        SELECT component_id, component_quantity
+        FROM player_inventories
+        WHERE player_id = $1 AND component_id = ANY($2::int[])
+        ORDER BY component_id
+        FOR UPDATE
+    ),
+    shortfall AS (
+        SELECT w.component_id, w.quantity AS required, COALESCE(l.component_quantity, 0) AS available
+        FROM wanted w
+        LEFT JOIN locked l ON l.component_id = w.component_id
+        WHERE COALESCE(l.component_quantity, 0) < w.quantity
+    ),
+    removed AS (
+        DELETE FROM player_inventories pi
+        USING wanted w, locked l
+        WHERE NOT EXISTS (SELECT 1 FROM shortfall)
+          AND pi.player_id = $1 AND pi.component_id = w.component_id AND l.component_id = w.component_id
+          AND l.component_quantity - w.quantity < 1
+    ),
+    updated AS (
+        UPDATE player_inventories pi
+        SET component_quantity = l.component_quantity - w.quantity
+        FROM wanted w, locked l
+        WHERE NOT EXISTS (SELECT 1 FROM shortfall)
+          AND pi.player_id = $1 AND pi.component_id = w.component_id AND l.component_id = w.component_id
+          AND l.component_quantity - w.quantity >= 1
+    )
+    SELECT component_id, required, available FROM shortfall;
+"""
+INVENTORY_ROW_DELETE_SQL = "DELETE FROM player_inventories WHERE player_id = $1 AND component_id = $2;"
+
+# The recipe CTEs the in-memory RecipeCatalog replaced; still used until the catalog has loaded
+POSSIBLE_MEDICINES_SQL = """
+    WITH player_inventory AS (
+        SELECT p.id AS player_id, pi.component_id, pi.component_quantity
+        FROM players p
+        JOIN player_inventories pi ON p.id = pi.player_id
+        WHERE p.id = $1
+    ),
+    required_components AS (
+        SELECT mr.medicine_id, mr.component_id, mr.component_number, mr.component_quantity
+        FROM medicine_recipes mr
+    ),
+    player_component_quantities AS (
+        SELECT rc.medicine_id, rc.component_number,
+               COALESCE(SUM(pi.component_quantity), 0) AS player_total_quantity
+        FROM required_components rc
+        LEFT JOIN player_inventory pi ON rc.component_id = pi.component_id
+        GROUP BY rc.medicine_id, rc.component_number
+    ),
+    sufficient_components AS (
+        SELECT rc.medicine_id, rc.component_number, rc.component_quantity,
+               COALESCE(pcg.player_total_quantity, 0) AS player_total_quantity
+        FROM required_components rc
+        LEFT JOIN player_component_quantities pcg
+        ON rc.medicine_id = pcg.medicine_id AND rc.component_number = pcg.component_number
+    ),
+    craftable_medicines AS (
+        SELECT medicine_id, FLOOR(MIN(player_total_quantity / component_quantity)) AS max_crafts
+        FROM sufficient_components
+        GROUP BY medicine_id
+        HAVING FLOOR(MIN(player_total_quantity / component_quantity)) > 0
+    )
+    SELECT m.*, cm.max_crafts
+    FROM craftable_medicines cm
+    JOIN medicines m ON cm.medicine_id = m.id;
+"""
+POSSIBLE_ALCHEMY_SQL = """
+    WITH player_inventory AS (
+        SELECT p.id AS player_id, pi.component_id, pi.component_quantity
+        FROM players p
+        JOIN player_inventories pi ON p.id = pi.player_id
+        WHERE p.id = $1
+    ),
+    required_components AS (
+        SELECT ar.item_id, ar.component_id, ar.component_number, ar.component_quantity
+        FROM alchemical_recipes ar
+    ),
+    player_component_quantities AS (
+        SELECT rc.item_id, rc.component_number,
+               COALESCE(SUM(pi.component_quantity), 0) AS player_total_quantity
+        FROM required_components rc
+        LEFT JOIN player_inventory pi ON rc.component_id = pi.component_id
+        GROUP BY rc.item_id, rc.component_number
+    ),
+    sufficient_components AS (
+        SELECT rc.item_id, rc.component_number, rc.component_quantity,
+               COALESCE(pcg.player_total_quantity, 0) AS player_total_quantity
+        FROM required_components rc
+        LEFT JOIN player_component_quantities pcg
+        ON rc.item_id = pcg.item_id AND rc.component_number = pcg.component_number
+    ),
+    craftableitems AS (
+        SELECT item_id, FLOOR(MIN(player_total_quantity / component_quantity)) AS max_crafts
+        FROM sufficient_components
+        GROUP BY item_id
+        HAVING FLOOR(MIN(player_total_quantity / component_quantity)) > 0
+    )
+    SELECT ai.*, ci.max_crafts
+    FROM craftableitems ci
+    JOIN alchemical_items ai ON ci.item_id = ai.id;
+"""
+
+# Statements prepared on every new pooled connection, with arguments that match no rows
+HOT_STATEMENTS = {
+    "server_id": (SERVER_ID_SQL, (0,)),
+    "player_id": (PLAYER_ID_SQL, (0, 0)),
+    "player": (PLAYER_SQL, (0, 0)),
+    "player_inventory": (PLAYER_INVENTORY_SQL, (0,)),
+    "inventory_quantities": (INVENTORY_QUANTITIES_SQL, (0,)),
+    "inventory_delta": (INVENTORY_DELTA_SQL, (0, 0, 0)),
+    "consume_recipe": (CONSUME_RECIPE_SQL, (0, [], []))
+}
+
+# Database attributes that make up the catalog, as stored in the snapshot
+CATALOG_ATTRIBUTES = (
+    "regions", "creatures", "components", "medicines", "alchemical_items",
+    "catalog", "component_dossiers", "search_index", "creature_index", "component_index"
+)
 
 class Database:
     """Provides an interface to the inventory/recipe database"""
 
     def __init__(self):
         self.pool = None
-        self.regions = []
-        self.creatures = []
-        self.components = []
-        self.medicines = []
-        self.alchemical_items = []
         self.discord_members = []
+        # The live catalog generation; replaced as a whole, never mutated in place
+        self._catalog = {
+            "regions": [], "creatures": [], "components": [], "medicines": [], "alchemical_items": [],
+            "catalog": None, "component_dossiers": None, "search_index": None, "creature_index": None,
+            "component_index": None
+        }
+        self._catalog_lock = asyncio.Lock()
+        self.catalog_swap_callbacks = {}
+        self._server_ids = {}
+        self._player_ids = {}
+        self._players = {}
+        self._identity_stats = {"hits": 0, "misses": 0}
+        self.rosters = {}
+        self.image_urls = {}
+        self.catalog_version = None
+        self.catalog_source = None
+        self._verify_task = None
 
     async def connect(self):
         print("[DB] Connecting...")
-        self.pool = await asyncpg.create_pool(
-            user='postgres',
-            password=DB_PASS,
-            database='botdb',
-            host='localhost',
-            port=5432,
-            min_size=1,
-            max_size=5
-        )
+        config = pool_config()
+        if await ensure_inventory_key(config):
+            print("[DB] Added the player_inventories (player_id, component_id) unique index")
+        self.pool = InstrumentedPool(HOT_STATEMENTS)
+        await self.pool.create(**config)
+
+    def get_pool_stats(self) -> dict[str, any]:
+        return self.pool.stats()
+
+    @staticmethod
+    def get_method_stats(limit: int = 10) -> list[tuple[str, dict[str, any]]]:
+        """Returns per-method call statistics for the slowest methods by p95 execution time"""
+        return instrumentation.top(limit)
+
+    @staticmethod
+    def set_instrumentation(enabled: bool) -> None:
+        instrumentation.enabled = enabled
 
     async def init_utils(self):
-        self.regions = await self.get_all_regions()
-        self.creatures = await self.get_all_creatures()
-        self.components = await self.get_all_components()
-        self.medicines = await self.get_all_medicines()
-        self.alchemical_items = await self.get_all_alchemy()
+        """Boots the catalog from the local snapshot when there is a usable one, otherwise from the database"""
+        with phase("images load"):
+            self.image_urls = await asyncio.to_thread(self._load_image_urls)
+
+        with phase("catalog snapshot load"):
+            snapshot = await asyncio.to_thread(load_snapshot, SNAPSHOT_PATH)
+
+        if snapshot:
+            self._install_catalog(snapshot["catalog"], snapshot["version"])
+            self.catalog_source = "snapshot"
+            self._verify_task = asyncio.create_task(self.verify_catalog_snapshot())
+        else:
+            await self.reload_catalog()
+            self.catalog_source = "database"
+
+    @staticmethod
+    def _load_image_urls() -> dict[str, str]:
+        with open('images.json', 'r') as file:
+            return {item['name']: item['url'] for item in json.load(file)}
+
+    async def reload_catalog(self, version: str = None) -> dict[str, any]:
+        """Builds a complete new catalog off to the side, swaps it in and refreshes the snapshot
+
+        Returns the new version, whether it changed, the seconds taken and the resident memory delta.
+        """
+        async with self._catalog_lock:
+            start = time.perf_counter()
+            rss_before = resident_memory()
+            previous_version = self.catalog_version
+
+            with phase("catalog fetch"):
+                if version is None:
+                    version, rows, image_urls = await asyncio.gather(
+                        self.get_catalog_version(), self.fetch_catalog_rows(), asyncio.to_thread(self._load_image_urls))
+                else:
+                    rows, image_urls = await asyncio.gather(self.fetch_catalog_rows(), asyncio.to_thread(self._load_image_urls))
+
+            with phase("catalog build"):
+                catalog = self.build_catalog(rows)
+            self.image_urls = image_urls
+            self._install_catalog(catalog, version)
+
+            snapshot_bytes = None
+            try:
+                with phase("catalog snapshot write"):
+                    snapshot_bytes = await asyncio.to_thread(save_snapshot, SNAPSHOT_PATH, version, catalog)
+            except OSError:
+                traceback.print_exc()
+
+            # Let the previous generation go before measuring, unless an in-flight command still holds it
+            del rows, catalog
+            gc.collect()
+            rss_after = resident_memory()
+
+            return {
+                "version": version,
+                "changed": version != previous_version,
+                "seconds": time.perf_counter() - start,
+                "memory_delta": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                "snapshot_bytes": snapshot_bytes
+            }
+
+    async def verify_catalog_snapshot(self) -> None:
+        """Rebuilds from the database in the background if the snapshot's catalog version is out of date"""
+        try:
+            with phase("catalog snapshot verify"):
+                version = await self.get_catalog_version()
+            if version != self.catalog_version:
+                print("[DB] Catalog snapshot is stale, rebuilding from the database")
+                await self.reload_catalog(version)
+        except Exception:
+            traceback.print_exc()
+
+    async def get_catalog_version(self) -> str:
+        """Returns a fingerprint of the contents of every catalog table"""
+        fingerprints = " UNION ALL ".join(
+            f"SELECT '{table}' AS name, md5(coalesce(string_agg(t::text, ',' ORDER BY t::text), '')) AS fingerprint FROM {table} t"
+            for table in CATALOG_TABLES
+        )
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(
+                f"SELECT md5(string_agg(fingerprint, ',' ORDER BY name)) FROM ({fingerprints}) tables;")
+
+    async def fetch_catalog_rows(self) -> dict[str, list[dict[str, any]]]:
+        """Loads every catalog table concurrently, each query on its own pooled connection"""
+        names = (
+            "regions", "creatures", "components", "medicines", "alchemical_items",
+            "medicine_recipe_rows", "alchemy_recipe_rows", "component_sources", "creature_components"
+        )
+        rows = await asyncio.gather(
+            self.get_all_regions(),
+            self.get_all_creatures(),
+            self.get_all_components(),
+            self.get_all_medicines(),
+            self.get_all_alchemy(),
+            self.get_all_recipe_rows("Medicine"),
+            self.get_all_recipe_rows("Alchemy"),
+            self.get_all_component_sources(),
+            self.get_all_creature_components()
+        )
+        return dict(zip(names, rows))
+
+    @staticmethod
+    def build_catalog(rows: dict[str, list[dict[str, any]]]) -> dict[str, any]:
+        """Builds every catalog index from fetched table rows, keyed by Database attribute"""
+        catalog = RecipeCatalog(rows["medicines"], rows["alchemical_items"], rows["medicine_recipe_rows"], rows["alchemy_recipe_rows"])
+        return {
+            "regions": rows["regions"],
+            "creatures": rows["creatures"],
+            "components": rows["components"],
+            "medicines": rows["medicines"],
+            "alchemical_items": rows["alchemical_items"],
+            "catalog": catalog,
+            "component_dossiers": ComponentDossier(rows["components"], rows["component_sources"], catalog),
+            "search_index": SearchIndex({
+                "Component": [component["display_name"] for component in rows["components"]],
+                "Medicine": [medicine["display_name"] for medicine in rows["medicines"]],
+                "Alchemy": [item["display_name"] for item in rows["alchemical_items"]],
+                "Region": [region["name"] for region in rows["regions"]],
+                "Creature": [creature["creature_name"] for creature in rows["creatures"]]
+            }),
+            "creature_index": CreatureIndex(rows["creatures"], rows["creature_components"]),
+            "component_index": ComponentIndex(rows["components"])
+        }
+
+    def _install_catalog(self, catalog: dict[str, any], version: str) -> None:
+        # A single reference swap, so a lookup never sees a half-built or mixed catalog
+        self._catalog = catalog
+        self.catalog_version = version
+        for callback in self.catalog_swap_callbacks.values():
+            callback()
+
+    async def get_all_recipe_rows(self, craft_type: str) -> list[dict[str, any]]:
+        """Returns every recipe component row for Medicine or Alchemy, ordered by recipe and group"""
+        async with self.pool.acquire() as conn:
+            if craft_type == "Medicine":
+                rows = await conn.fetch(
+                    """
+                    SELECT rc.component_number, m.name AS recipe, c.id, c.name, c.display_name,
+                           rc.component_quantity AS quantity, rc.rank_quantity
+                    FROM medicines m
+                    JOIN medicine_recipes rc ON m.id = rc.medicine_id
+                    JOIN components c ON rc.component_id = c.id
+                    ORDER BY m.name, rc.component_number;
+                    """
+                )
+            else:
+                rows = await conn.fetch(
+                    """
+                    SELECT rc.component_number, m.name AS recipe, c.id, c.name, c.display_name,
+                           rc.component_quantity AS quantity
+                    FROM alchemical_items m
+                    JOIN alchemical_recipes rc ON m.id = rc.item_id
+                    JOIN components c ON rc.component_id = c.id
+                    ORDER BY m.name, rc.component_number;
+                    """
+                )
+            return [dict(row) for row in rows]
 
     async def register_new_server(self, discord_server_id):
+        self._server_ids.pop(discord_server_id, None)
         async with self.pool.acquire() as conn:
             await conn.execute(
                 "INSERT INTO servers (server_id) VALUES ($1);", discord_server_id)
@@ -49,12 +417,18 @@ class Database:
                 await conn.execute("DELETE FROM dms WHERE server_id = $1;", db_unique_server_id)
                 await conn.execute("DELETE FROM players WHERE server_id = $1;", db_unique_server_id)
                 await conn.execute("DELETE FROM servers WHERE id = $1;", db_unique_server_id)
+        self._invalidate_server(db_unique_server_id)
 
     async def get_server_database_id(self, discord_server_id) -> int:
+        if discord_server_id in self._server_ids:
+            self._identity_stats["hits"] += 1
+            return self._server_ids[discord_server_id]
+        self._identity_stats["misses"] += 1
+
         async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                "SELECT id FROM servers WHERE server_id = $1", discord_server_id
-            )
+            result = await conn.fetchrow(SERVER_ID_SQL, discord_server_id)
+            if result:
+                self._server_ids[discord_server_id] = result["id"]
             return result["id"] if result else 0
 
     async def get_server_id_from_database_id(self, db_unique_server_id) -> int:
@@ -65,10 +439,15 @@ class Database:
             return result["server_id"] if result else 0
 
     async def get_player_database_id(self, discord_user_id, db_unique_server_id) -> int:
+        if (discord_user_id, db_unique_server_id) in self._player_ids:
+            self._identity_stats["hits"] += 1
+            return self._player_ids[(discord_user_id, db_unique_server_id)]
+        self._identity_stats["misses"] += 1
+
         async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                "SELECT id FROM players WHERE user_id = $1 AND server_id = $2", discord_user_id, db_unique_server_id
-            )
+            result = await conn.fetchrow(PLAYER_ID_SQL, discord_user_id, db_unique_server_id)
+            if result:
+                self._player_ids[(discord_user_id, db_unique_server_id)] = result["id"]
             return result["id"] if result else 0
 
     async def get_user_id_from_database_id(self, db_unique_user_id, db_unique_server_id) -> int:
@@ -84,16 +463,62 @@ class Database:
             return [dict(row) for row in rows]
 
     async def get_player(self, db_unique_player_id: int, server_id: int) -> dict:
+        player = self._players.get(db_unique_player_id)
+        if player and player["server_id"] == server_id:
+            self._identity_stats["hits"] += 1
+            return player
+        self._identity_stats["misses"] += 1
+
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow("SELECT * FROM players WHERE id = $1 AND server_id = $2;", db_unique_player_id, server_id)
+            row = await conn.fetchrow(PLAYER_SQL, db_unique_player_id, server_id)
+            if row:
+                self._players[db_unique_player_id] = dict(row)
             return dict(row) if row else {}
 
+    async def resolve_player(self, discord_server_id: int, discord_user_id: int) -> tuple[int, int, dict]:
+        """Resolves a guild and member to their server id, player id and player row"""
+        db_unique_server_id = await self.get_server_database_id(discord_server_id)
+        db_unique_player_id = await self.get_player_database_id(discord_user_id, db_unique_server_id)
+        player = await self.get_player(db_unique_player_id, db_unique_server_id) if db_unique_player_id else {}
+        return db_unique_server_id, db_unique_player_id, player
+
+    def get_identity_cache_stats(self) -> dict[str, any]:
+        hits = self._identity_stats["hits"]
+        misses = self._identity_stats["misses"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "servers": len(self._server_ids),
+            "players": len(self._players)
+        }
+
+    def _invalidate_player(self, db_unique_player_id: int) -> None:
+        self._players.pop(db_unique_player_id, None)
+        for key in [key for key, player_id in self._player_ids.items() if player_id == db_unique_player_id]:
+            del self._player_ids[key]
+
+    def invalidate_roster(self, db_unique_server_id: int) -> None:
+        """Drops a server's cached player roster so the next autocomplete rebuilds it"""
+        self.rosters.pop(db_unique_server_id, None)
+
+    def _invalidate_server(self, db_unique_server_id: int) -> None:
+        self.invalidate_roster(db_unique_server_id)
+        for key in [key for key, server_id in self._server_ids.items() if server_id == db_unique_server_id]:
+            del self._server_ids[key]
+        for key in [key for key in self._player_ids if key[1] == db_unique_server_id]:
+            del self._player_ids[key]
+        for key in [key for key, player in self._players.items() if player["server_id"] == db_unique_server_id]:
+            del self._players[key]
+
     async def register_player(self, discord_user_id: int, server_id: int, character_name: str) -> None:
+        self._player_ids.pop((discord_user_id, server_id), None)
         async with self.pool.acquire() as conn:
             await conn.execute(
                 "INSERT INTO players (user_id, character_name, server_id) VALUES ($1, $2, $3);",
                 discord_user_id, character_name, server_id
             )
+        self.invalidate_roster(server_id)
 
     async def deregister_player(self, db_unique_player_id: int, server_id: int) -> None:
         async with self.pool.acquire() as conn:
@@ -106,6 +531,8 @@ class Database:
                     db_unique_player_id
                 )
                 await conn.execute("DELETE FROM players WHERE id = $1 AND server_id = $2;", db_unique_player_id, server_id)
+        self._invalidate_player(db_unique_player_id)
+        self.invalidate_roster(server_id)
 
     async def get_server_dm(self, server_id) -> dict:
         async with self.pool.acquire() as conn:
@@ -129,67 +556,116 @@ class Database:
                 await conn.execute(
                     "DELETE FROM dms WHERE user_id = $1 AND server_id = $2", discord_user_id, server_id)
 
-    async def get_player_inventory(self, db_unique_player_id: int) -> list[dict[str, any]]:
+    async def get_player_inventory(self, db_unique_player_id: int) -> Inventory:
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT c.id, c.name, c.display_name, pi.component_quantity AS quantity
-                FROM players p
-                JOIN player_inventories pi ON p.id = pi.player_id
-                JOIN components c ON pi.component_id = c.id
-                WHERE p.id = $1;
-                """,
-                db_unique_player_id
-            )
-            return [dict(row) for row in rows] if rows else {}
+            rows = await conn.fetch(PLAYER_INVENTORY_SQL, db_unique_player_id)
+            return Inventory(rows)
+
+    async def apply_inventory_delta(self, db_unique_player_id: int, component_id: int, delta: int) -> int | None:
+        """Applies a signed delta to a single inventory row and returns the new quantity
+
+        0 means the row was emptied and deleted, None that there was no row to subtract from.
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(INVENTORY_DELTA_SQL, db_unique_player_id, component_id, delta)
+            return row["component_quantity"] if row else None
+
+    async def consume_recipe(self, db_unique_player_id: int, components: dict[int, int]) -> tuple[bool, list[dict[str, int]]]:
+        """Removes every component of a craft in one round trip, or nothing if the player falls short"""
+        component_ids = sorted(components)
+        quantities = [components[component_id] for component_id in component_ids]
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(CONSUME_RECIPE_SQL, db_unique_player_id, component_ids, quantities)
+            shortfall = [dict(row) for row in rows]
+            return not shortfall, shortfall
+
+    async def transfer_items(self, from_player_id: int, to_player_id: int, component_id: int, quantity: int) -> tuple[bool, list[dict[str, int]]]:
+        return await self.transfer_items_bulk(from_player_id, to_player_id, {component_id: quantity})
+
+    async def transfer_items_bulk(self, from_player_id: int, to_player_id: int, components: dict[int, int]) -> tuple[bool, list[dict[str, int]]]:
+        """Moves components between two players in one transaction, or nothing if the sender falls short"""
+        component_ids = sorted(components)
+        quantities = [components[component_id] for component_id in component_ids]
 
-    async def add_player_inventory_item(self, db_unique_player_id: int, component_name: str, amount: int) -> None:
         async with self.pool.acquire() as conn:
             async with conn.transaction():
-                await conn.execute(
-                    """
-                    UPDATE player_inventories
-                    SET component_quantity = component_quantity + $1
-                    WHERE player_id = (SELECT id FROM players WHERE id = $2)
-                    AND component_id = (SELECT id FROM components WHERE name = $3);
-                    """,
-                    amount, db_unique_player_id, component_name
-                )
+                locked = await self._lock_inventory_rows(conn, sorted({from_player_id, to_player_id}), component_ids)
+                shortfall = self._find_shortfall(locked, from_player_id, component_ids, quantities)
+                if shortfall:
+                    return False, shortfall
+
+                await self._remove_inventory_rows(conn, from_player_id, component_ids, quantities)
+                # The recipient's rows for components they don't hold yet aren't locked, so upsert on the unique key
                 await conn.execute(
                     """
                     INSERT INTO player_inventories (player_id, component_id, component_quantity)
-                    SELECT (SELECT id FROM players WHERE id = $1),
-                           (SELECT id FROM components WHERE name = $2),
-                           $3
-                    WHERE NOT EXISTS (
-                        SELECT 1 FROM player_inventories
-                        WHERE player_id = (SELECT id FROM players WHERE id = $1)
-                        AND component_id = (SELECT id FROM components WHERE name = $2)
-                    );
+                    SELECT $1, w.component_id, w.quantity
+                    FROM unnest($2::int[], $3::int[]) AS w(component_id, quantity)
+                    WHERE w.quantity > 0
+                    ON CONFLICT (player_id, component_id)
+                    DO UPDATE SET component_quantity = player_inventories.component_quantity + EXCLUDED.component_quantity;
                     """,
-                    db_unique_player_id, component_name, amount
+                    to_player_id, component_ids, quantities
                 )
-                await self._clean_inventory_table()
+                return True, []
 
-    async def sub_player_inventory_item(self, db_unique_player_id: int, component_name: str, amount: int) -> None:
-        await self.add_player_inventory_item(db_unique_player_id, component_name, -amount)
+    @staticmethod
+    async def _lock_inventory_rows(conn, player_ids: list[int], component_ids: list[int]) -> dict[tuple[int, int], int]:
+        # Rows are always locked in (player_id, component_id) order so concurrent crafts and transfers can't deadlock
+        rows = await conn.fetch(
+            """
+            SELECT player_id, component_id, component_quantity
+            FROM player_inventories
+            WHERE player_id = ANY($1::int[]) AND component_id = ANY($2::int[])
+            ORDER BY player_id, component_id
+            FOR UPDATE;
+            """,
+            player_ids, component_ids
+        )
+        return {(row["player_id"], row["component_id"]): row["component_quantity"] for row in rows}
 
-    async def delete_player_inventory_item(self, db_unique_player_id: int, component_name: str) -> None:
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                """
-                DELETE FROM player_inventories
-                WHERE player_id = (SELECT id FROM players WHERE id = $1)
-                AND component_id = (SELECT id FROM components WHERE name = $2);
-                """,
-                db_unique_player_id, component_name
-            )
+    @staticmethod
+    def _find_shortfall(locked: dict[tuple[int, int], int], db_unique_player_id: int,
+                        component_ids: list[int], quantities: list[int]) -> list[dict[str, int]]:
+        return [
+            {"component_id": component_id, "required": quantity, "available": locked.get((db_unique_player_id, component_id), 0)}
+            for component_id, quantity in zip(component_ids, quantities)
+            if locked.get((db_unique_player_id, component_id), 0) < quantity
+        ]
+
+    @staticmethod
+    async def _remove_inventory_rows(conn, db_unique_player_id: int, component_ids: list[int], quantities: list[int]) -> None:
+        await conn.execute(
+            """
+            UPDATE player_inventories pi
+            SET component_quantity = pi.component_quantity - w.quantity
+            FROM unnest($2::int[], $3::int[]) AS w(component_id, quantity)
+            WHERE pi.player_id = $1 AND pi.component_id = w.component_id;
+            """,
+            db_unique_player_id, component_ids, quantities
+        )
+        await conn.execute(
+            """
+            DELETE FROM player_inventories
+            WHERE player_id = $1 AND component_id = ANY($2::int[]) AND component_quantity < 1;
+            """,
+            db_unique_player_id, component_ids
+        )
+
+    async def add_player_inventory_item(self, db_unique_player_id: int, component_id: int, amount: int) -> int | None:
+        return await self.apply_inventory_delta(db_unique_player_id, component_id, amount)
+
+    async def sub_player_inventory_item(self, db_unique_player_id: int, component_id: int, amount: int) -> int | None:
+        return await self.apply_inventory_delta(db_unique_player_id, component_id, -amount)
 
-    async def _clean_inventory_table(self) -> None:
+    async def delete_player_inventory_item(self, db_unique_player_id: int, component_id: int) -> None:
         async with self.pool.acquire() as conn:
-            await conn.execute("DELETE FROM player_inventories WHERE component_quantity < 1;")
+            await conn.execute(INVENTORY_ROW_DELETE_SQL, db_unique_player_id, component_id)
 
     async def get_medicine_recipe(self, name: str) -> list[list[dict[str, any]]]:
+        if self.catalog:
+            return self.catalog.get("Medicine", name).get("recipe", [])
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -209,6 +685,8 @@ class Database:
             return list(grouped.values())
 
     async def get_alchemy_recipe(self, name: str) -> list[list[dict[str, any]]]:
+        if self.catalog:
+            return self.catalog.get("Alchemy", name).get("recipe", [])
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -227,27 +705,57 @@ class Database:
                 grouped[row["component_number"]].append(dict(row))
             return list(grouped.values())
 
+    async def get_recipe_card(self, craft_type: str, name: str) -> dict[str, any]:
+        """Returns the recipe, description, strength and stats for one recipe in a single lookup"""
+        if self.catalog:
+            return self.catalog.get(craft_type, name)
+        table = "medicines" if craft_type == "Medicine" else "alchemical_items"
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(f"SELECT * FROM {table} WHERE name = $1;", name)
+        if not row:
+            return {}
+        card = dict(row)
+        card["recipe"] = await (self.get_medicine_recipe(name) if craft_type == "Medicine" else self.get_alchemy_recipe(name))
+        return card
+
     async def get_medicine_description(self, name: str) -> str:
+        if self.catalog:
+            entry = self.catalog.get("Medicine", name)
+            return entry["description"] if entry else "Description not found."
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT description FROM medicines WHERE name = $1;", name)
             return row["description"] if row else "Description not found."
 
     async def get_alchemy_description(self, name: str) -> str:
+        if self.catalog:
+            entry = self.catalog.get("Alchemy", name)
+            return entry["description"] if entry else "Description not found."
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT description FROM alchemical_items WHERE name = $1;", name)
             return row["description"] if row else "Description not found."
 
     async def get_special_requirements(self, name: str) -> str:
+        if self.catalog:
+            entry = self.catalog.get("Alchemy", name)
+            return entry["special_requirements"] if entry else "Description not found."
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT special_requirements FROM alchemical_items WHERE name = $1;", name)
             return row["special_requirements"] if row else "Description not found."
 
     async def get_medicine_strength(self, name: str) -> str:
+        if self.catalog:
+            entry = self.catalog.get("Medicine", name)
+            return entry["strength"] if entry else "Description not found."
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT strength FROM medicines WHERE name = $1;", name)
             return row["strength"] if row else "Description not found."
 
     async def get_medicine_stats(self, name: str) -> list[dict[str, any]]:
+        if self.catalog:
+            entry = self.catalog.get("Medicine", name)
+            if not entry:
+                return None
+            return [{key: entry[key] for key in ("boost", "boost_amt", "can_infinite", "duration", "dice", "rank_values")}]
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -260,47 +768,26 @@ class Database:
             return [dict(row) for row in rows] if rows else None
 
     async def get_alchemy_strength(self, name: str) -> str:
+        if self.catalog:
+            entry = self.catalog.get("Alchemy", name)
+            return entry["strength"] if entry else "Description not found."
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT strength FROM alchemical_items WHERE name = $1;", name)
             return row["strength"] if row else "Description not found."
 
+    async def get_player_inventory_quantities(self, db_unique_player_id: int) -> dict[int, int]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(INVENTORY_QUANTITIES_SQL, db_unique_player_id)
+            quantities = defaultdict(int)
+            for row in rows:
+                quantities[row["component_id"]] += row["component_quantity"]
+            return dict(quantities)
+
     async def get_player_possible_medicines(self, db_unique_player_id: int) -> list[dict[str, any]]:
+        if self.catalog:
+            return self.catalog.possible_crafts("Medicine", await self.get_player_inventory_quantities(db_unique_player_id))
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch("""
-                WITH player_inventory AS (
-                    SELECT p.id AS player_id, pi.component_id, pi.component_quantity
-                    FROM players p
-                    JOIN player_inventories pi ON p.id = pi.player_id
-                    WHERE p.id = $1
-                ),
-                required_components AS (
-                    SELECT mr.medicine_id, mr.component_id, mr.component_number, mr.component_quantity
-                    FROM medicine_recipes mr
-                ),
-                player_component_quantities AS (
-                    SELECT rc.medicine_id, rc.component_number,
-                           COALESCE(SUM(pi.component_quantity), 0) AS player_total_quantity
-                    FROM required_components rc
-                    LEFT JOIN player_inventory pi ON rc.component_id = pi.component_id
-                    GROUP BY rc.medicine_id, rc.component_number
-                ),
-                sufficient_components AS (
-                    SELECT rc.medicine_id, rc.component_number, rc.component_quantity,
-                           COALESCE(pcg.player_total_quantity, 0) AS player_total_quantity
-                    FROM required_components rc
-                    LEFT JOIN player_component_quantities pcg
-                    ON rc.medicine_id = pcg.medicine_id AND rc.component_number = pcg.component_number
-                ),
-                craftable_medicines AS (
-                    SELECT medicine_id, FLOOR(MIN(player_total_quantity / component_quantity)) AS max_crafts
-                    FROM sufficient_components
-                    GROUP BY medicine_id
-                    HAVING FLOOR(MIN(player_total_quantity / component_quantity)) > 0
-                )
-                SELECT m.*, cm.max_crafts
-                FROM craftable_medicines cm
-                JOIN medicines m ON cm.medicine_id = m.id;
-            """, db_unique_player_id)
+            rows = await conn.fetch(POSSIBLE_MEDICINES_SQL, db_unique_player_id)
 
         medicines = [dict(row) for row in rows]
 
@@ -311,42 +798,10 @@ class Database:
         return medicines
 
     async def get_player_possible_alchemy(self, db_unique_player_id: int) -> list[dict[str, any]]:
+        if self.catalog:
+            return self.catalog.possible_crafts("Alchemy", await self.get_player_inventory_quantities(db_unique_player_id))
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch("""
-                WITH player_inventory AS (
-                    SELECT p.id AS player_id, pi.component_id, pi.component_quantity
-                    FROM players p
-                    JOIN player_inventories pi ON p.id = pi.player_id
-                    WHERE p.id = $1
-                ),
-                required_components AS (
-                    SELECT ar.item_id, ar.component_id, ar.component_number, ar.component_quantity
-                    FROM alchemical_recipes ar
-                ),
-                player_component_quantities AS (
-                    SELECT rc.item_id, rc.component_number,
-                           COALESCE(SUM(pi.component_quantity), 0) AS player_total_quantity
-                    FROM required_components rc
-                    LEFT JOIN player_inventory pi ON rc.component_id = pi.component_id
-                    GROUP BY rc.item_id, rc.component_number
-                ),
-                sufficient_components AS (
-                    SELECT rc.item_id, rc.component_number, rc.component_quantity,
-                           COALESCE(pcg.player_total_quantity, 0) AS player_total_quantity
-                    FROM required_components rc
-                    LEFT JOIN player_component_quantities pcg
-                    ON rc.item_id = pcg.item_id AND rc.component_number = pcg.component_number
-                ),
-                craftableitems AS (
-                    SELECT item_id, FLOOR(MIN(player_total_quantity / component_quantity)) AS max_crafts
-                    FROM sufficient_components
-                    GROUP BY item_id
-                    HAVING FLOOR(MIN(player_total_quantity / component_quantity)) > 0
-                )
-                SELECT ai.*, ci.max_crafts
-                FROM craftableitems ci
-                JOIN alchemical_items ai ON ci.item_id = ai.id;
-            """, db_unique_player_id)
+            rows = await conn.fetch(POSSIBLE_ALCHEMY_SQL, db_unique_player_id)
 
         items = [dict(row) for row in rows]
 
@@ -355,13 +810,50 @@ class Database:
 
         return items
 
+    async def get_party_crafts(self, server_id: int, craft_type: str) -> list[tuple[dict[str, any], list[dict[str, any]]]]:
+        """Returns every player in a server paired with what they can craft"""
+        players = await self.get_all_players(server_id)
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT pi.player_id, pi.component_id, pi.component_quantity
+                FROM player_inventories pi
+                JOIN players p ON p.id = pi.player_id
+                WHERE p.server_id = $1;
+                """,
+                server_id
+            )
+
+        inventories = {player["id"]: defaultdict(int) for player in players}
+        for row in rows:
+            inventories[row["player_id"]][row["component_id"]] += row["component_quantity"]
+
+        crafts = self.catalog.party_crafts(craft_type, [inventories[player["id"]] for player in players])
+        return list(zip(players, crafts))
+
+    async def can_craft(self, db_unique_player_id: int, craft_type: str, recipe_id: int) -> tuple[bool, Inventory, dict[str, any]]:
+        """Checks a single recipe against the player's inventory, returning the inventory and recipe it used"""
+        item = self.catalog.get_by_id(craft_type, recipe_id)
+        if not item:
+            return False, Inventory(), {}
+
+        player_inventory = await self.get_player_inventory(db_unique_player_id)
+        if not player_inventory:
+            return False, player_inventory, item
+
+        requirements = self.catalog.medicine_requirements if craft_type == "Medicine" else self.catalog.alchemy_requirements
+        crafts = self.catalog.max_crafts(requirements.get(item["name"], ()), player_inventory.quantities)
+        return crafts > 0, player_inventory, item
+
     async def player_can_craft_medicine(self, db_unique_player_id: int, medicine_name: str) -> bool:
-        medicines = await self.get_player_possible_medicines(db_unique_player_id)
-        return medicine_name in [m["name"] for m in medicines]
+        medicine = self.catalog.get("Medicine", medicine_name)
+        can_craft, _, _ = await self.can_craft(db_unique_player_id, "Medicine", medicine.get("id"))
+        return can_craft
 
     async def player_can_craft_alchemy(self, db_unique_player_id: int, alchemy_name: str) -> bool:
-        items = await self.get_player_possible_alchemy(db_unique_player_id)
-        return alchemy_name in [i["name"] for i in items]
+        item = self.catalog.get("Alchemy", alchemy_name)
+        can_craft, _, _ = await self.can_craft(db_unique_player_id, "Alchemy", item.get("id"))
+        return can_craft
 
     async def get_components_by_region(self, name: str) -> list[dict[str, any]]:
         async with self.pool.acquire() as conn:
@@ -393,7 +885,22 @@ class Database:
             )
             return [dict(row) for row in rows]
 
+    async def get_all_creature_components(self) -> list[dict[str, any]]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT c.id, c.name, c.display_name, cr.creature_name, cr.creature_base, cc.amount, cc.dc
+                FROM creature_components cc
+                JOIN components c ON cc.component_id = c.id
+                JOIN creatures cr ON cc.creature_id = cr.id
+                ORDER BY cr.creature_name, cc.dc;
+                """
+            )
+            return [dict(row) for row in rows]
+
     async def get_components_by_creature_name(self, base: str, name: str) -> list[dict[str, any]]:
+        if self.creature_index:
+            return self.creature_index.get_components(base, name)
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -409,6 +916,9 @@ class Database:
             return [dict(row) for row in rows]
 
     async def get_creatures_by_creature_base(self, name: str) -> list[dict[str, any]]:
+        if self.creature_index:
+            return [{"id": creature["id"], "creature_name": creature["creature_name"]}
+                    for creature in self.creature_index.get_by_base(name)]
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 "SELECT cr.id, cr.creature_name FROM creatures cr WHERE cr.creature_base = $1;",
@@ -417,6 +927,9 @@ class Database:
             return [dict(row) for row in rows]
 
     async def get_creature_by_name(self, base: str, name: str) -> list[dict[str, any]]:
+        if self.creature_index:
+            creature = self.creature_index.get(base, name)
+            return [creature] if creature else []
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 "SELECT * FROM creatures WHERE creature_base = $1 AND creature_name = $2;",
@@ -470,6 +983,48 @@ class Database:
             )
             return [dict(row) for row in creature + regions + common + merchant]
 
+    async def get_all_component_sources(self) -> list[dict[str, any]]:
+        async with self.pool.acquire() as conn:
+            creature = await conn.fetch(
+                """
+                SELECT cc.component_id, c.name, c.display_name, cc.amount, cr.creature_name AS source_name,
+                       'Creature' AS source_type, cr.creature_base AS source_detail, cc.dc AS roll
+                FROM creature_components cc
+                JOIN components c ON cc.component_id = c.id
+                JOIN creatures cr ON cc.creature_id = cr.id;
+                """
+            )
+            regions = await conn.fetch(
+                """
+                SELECT rc.component_id, c.name, c.display_name, NULL AS amount, r.name AS source_name,
+                       'Region' AS source_type, NULL AS source_detail, rc.dc AS roll
+                FROM region_components rc
+                JOIN components c ON rc.component_id = c.id
+                JOIN regions r ON rc.region_id = r.id;
+                """
+            )
+            common = await conn.fetch(
+                """
+                SELECT ct.component_id, c.name, c.display_name, NULL AS amount, ct.type AS source_name,
+                       'CommonTable' AS source_type, NULL AS source_detail, ct.roll AS roll
+                FROM common_tables ct
+                JOIN components c ON ct.component_id = c.id;
+                """
+            )
+            merchant = await conn.fetch(
+                """
+                SELECT mc.component_id, c.name, c.display_name, mc.cost AS amount, NULL AS source_name,
+                       'Merchant' AS source_type, mc.availability AS source_detail, NULL AS roll
+                FROM merchant_components mc
+                JOIN components c ON mc.component_id = c.id;
+                """
+            )
+            return [dict(row) for row in creature + regions + common + merchant]
+
+    async def get_component_dossier(self, name: str) -> dict[str, any]:
+        """Returns a component with its sources, the recipes that use it and the medicines it boosts"""
+        return self.component_dossiers.get(name) if self.component_dossiers else {}
+
     async def get_component_recipes(self, name: str) -> list[dict[str, any]]:
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
@@ -508,6 +1063,8 @@ class Database:
             return [dict(row) for row in rows]
 
     async def get_component_by_name(self, name: str) -> dict:
+        if self.component_index:
+            return self.component_index.get_by_name(name) or {}
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow("SELECT * FROM components WHERE name = $1;", name)
             return dict(row) if row else {}
@@ -553,4 +1110,27 @@ class Database:
             return [dict(row) for row in rows]
 
 
+def _catalog_attribute(attribute: str) -> property:
+    return property(lambda self: self._catalog[attribute])
+
+
+for _attribute in CATALOG_ATTRIBUTES:
+    setattr(Database, _attribute, _catalog_attribute(_attribute))
+
+# Every public coroutine is instrumented at the class, so switching it on or off needs no cog reload
+instrumentation = DatabaseInstrumentation(enabled=os.getenv("DB_INSTRUMENTATION", "true").lower() in ("1", "true", "yes"))
+for _name, _method in list(vars(Database).items()):
+    if inspect.iscoroutinefunction(_method) and not _name.startswith("_"):
+        setattr(Database, _name, instrumentation.wrap(_name, _method))
+
+
+def resident_memory() -> int | None:
+    """Returns the process's resident set size in bytes, where the platform exposes it"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
 db = Database()
@@ -29,9 +29,6 @@ class DungeonMasterCommands(commands.GroupCog, group_name="dm"):
 
         player_inventory = await db.get_player_inventory(db_unique_player_id)
         player = await db.get_player(db_unique_player_id, db_unique_server_id)
-        essences = []
-        common_flora = []
-        specialty_items = []
 
         if player:
             if player_inventory:
@@ -40,13 +37,10 @@ class DungeonMasterCommands(commands.GroupCog, group_name="dm"):
                 embed = Embed(title=title, color=role_color)
                 embed.set_author(name=player["character_name"], icon_url=interaction.user.display_avatar.url)
 
-                for item in player_inventory:
-                    if item["display_name"] in utils.essence_names:
-                        essences.append(f"{item["display_name"]}: {item["quantity"]}")
-                    elif item["display_name"] in utils.common_flora_names:
-                        common_flora.append(f"{item["display_name"]}: {item["quantity"]}")
-                    else:
-                        specialty_items.append(f"{item["display_name"]}: {item["quantity"]}")
+                essences, common_flora, specialty_items = (
+                    [f"{display_name}: {quantity}" for display_name, quantity in group]
+                    for group in player_inventory.grouped(utils.essence_names, utils.common_flora_names)
+                )
 
                 embed.add_field(
                     name="Essences",
@@ -84,7 +78,7 @@ class DungeonMasterCommands(commands.GroupCog, group_name="dm"):
             await interaction.response.send_message(response)
             return
 
-        await db.add_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component), quantity)
+        await db.add_player_inventory_item(db_unique_player_id, db.component_index.get_by_display_name(component)['id'], quantity)
         await interaction.response.send_message(f"Added {quantity} {component} to {player["character_name"]}'s inventory!")
 
     @utils.has_role("Dungeon Master")
@@ -101,18 +95,13 @@ class DungeonMasterCommands(commands.GroupCog, group_name="dm"):
             await interaction.response.send_message(response)
             return
 
-        player_inventory = await db.get_player_inventory(db_unique_player_id)
-        has_item, amount = await utils.check_inventory(player_inventory, component)
+        remaining = await db.sub_player_inventory_item(db_unique_player_id, db.component_index.get_by_display_name(component)['id'], quantity)
 
-        if not has_item:
+        if remaining is None:
             await interaction.response.send_message(
                 f"{player['character_name']} does not have any {component} in their inventory!")
             return
 
-        if (amount - quantity) <= 0:
-            await db.delete_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component))
-        else:
-            await db.sub_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component), quantity)
         await interaction.response.send_message(f"Removed {quantity} {component} to {player["character_name"]}'s inventory!")
 
     @utils.has_role("Dungeon Master")
@@ -151,6 +140,41 @@ class DungeonMasterCommands(commands.GroupCog, group_name="dm"):
 
         await interaction.followup.send(embed=embed)
 
+    @utils.has_role("Dungeon Master")
+    @app_commands.command(
+        name="party_crafts",
+        description="Shows what every player can craft. Dungeon Master Only"
+    )
+    @app_commands.describe(craft_type="Medicine or Alchemical Item?")
+    @app_commands.autocomplete(craft_type=utils.type_autocompletion)
+    async def party_crafts(self, interaction, craft_type: str):
+        await interaction.response.defer()
+
+        if craft_type not in ('Medicine', 'Alchemy'):
+            await interaction.followup.send("Invalid type specified. Please choose from Medicine, Alchemy")
+            return
+
+        role_color = await utils.get_role_color(interaction)
+        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
+        party = await db.get_party_crafts(db_unique_server_id, craft_type)
+
+        title = "Party Medicines" if craft_type == 'Medicine' else "Party Alchemical Items"
+        embed = Embed(title=title, color=role_color)
+
+        for player, items in party[:25]:
+            crafts = "\n".join(f"{item['display_name']} x{item['max_crafts']}" for item in items)
+            if len(crafts) > 1024:
+                crafts = crafts[:1020].rsplit("\n", 1)[0] + "\n..."
+            embed.add_field(
+                name=player['character_name'],
+                value=crafts if crafts else "Nothing craftable.",
+                inline=False)
+
+        if not party:
+            embed.add_field(name="No registered players.", value="", inline=False)
+
+        await interaction.followup.send(embed=embed)
+
     async def cog_app_command_error(self, interaction, error: app_commands.AppCommandError):
         # Default error message
         message = None
@@ -1,5 +1,7 @@
 from discord.ext import commands
 import discord
+import utils
+
 from db import db  # assuming you import your db wrapper
 
 
@@ -48,6 +50,34 @@ class GuildEvents(commands.Cog):
         # Remove from database
         await db.remove_server(db_unique_server_id)
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            utils.invalidate_member_roles(after.guild.id, after.id)
+        if before.display_name != after.display_name:
+            db.invalidate_roster(await db.get_server_database_id(after.guild.id))
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        db.invalidate_roster(await db.get_server_database_id(member.guild.id))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        utils.invalidate_member_roles(member.guild.id, member.id)
+        db.invalidate_roster(await db.get_server_database_id(member.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        utils.invalidate_guild_roles(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        utils.invalidate_guild_roles(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        utils.invalidate_guild_roles(role.guild.id)
+
 
 async def setup(bot):
     await bot.add_cog(GuildEvents(bot))
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Per-method latency instrumentation for Database"""
+import functools
+import time
+from contextvars import ContextVar
+
+from inventory import Inventory
+from metrics import RollingHistogram
+from tracing import span
+
+# Connection wait accumulated by the instrumented call running in this context, as a one-item list
+current_call = ContextVar("current_call", default=None)
+
+
+def record_acquire_wait(seconds: float) -> None:
+    call = current_call.get()
+    if call is not None:
+        call[0] += seconds
+
+
+def count_rows(result) -> int:
+    """Counts rows in list, Inventory and single-row dict results; anything else counts as none"""
+    if isinstance(result, (list, Inventory)):
+        return len(result)
+    if isinstance(result, dict):
+        return 1 if result else 0
+    return 0
+
+
+class MethodStats:
+    __slots__ = ("calls", "errors", "rows", "acquire_wait", "execution")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.acquire_wait = RollingHistogram()
+        self.execution = RollingHistogram()
+
+    def summary(self) -> dict[str, any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "acquire_wait": self.acquire_wait.summary(),
+            "execution": self.execution.summary()
+        }
+
+
+class DatabaseInstrumentation:
+    """Wraps Database coroutines to record calls, acquire wait, execution time, rows and errors per method"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.methods = {}
+
+    def wrap(self, name: str, method):
+        @functools.wraps(method)
+        async def instrumented(*args, **kwargs):
+            with span(f"db.{name}"):
+                if not self.enabled:
+                    return await method(*args, **kwargs)
+                return await self._measure(name, method, args, kwargs)
+
+        return instrumented
+
+    async def _measure(self, name, method, args, kwargs):
+        stats = self.methods.get(name)
+        if stats is None:
+            stats = self.methods[name] = MethodStats()
+
+        call = [0.0]
+        token = current_call.set(call)
+        start = time.perf_counter()
+        rows = 0
+        try:
+            result = await method(*args, **kwargs)
+            rows = count_rows(result)
+            return result
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            current_call.reset(token)
+            # Waits in nested Database calls also count towards the caller's wait
+            record_acquire_wait(call[0])
+            stats.calls += 1
+            stats.rows += rows
+            stats.acquire_wait.observe(call[0])
+            stats.execution.observe(max(elapsed - call[0], 0.0))
+
+    def top(self, limit: int = 10) -> list[tuple[str, dict[str, any]]]:
+        """Returns (method, summary) for the methods with the highest p95 execution time"""
+        summaries = [(name, stats.summary()) for name, stats in self.methods.items()]
+        summaries.sort(key=lambda item: item[1]["execution"]["p95_ms"], reverse=True)
+        return summaries[:limit]
+
+    def reset(self) -> None:
+        self.methods = {}
@@ -0,0 +1,48 @@
+"""Player inventory keyed by component id"""
+
+
+class Inventory:
+    """A player's component quantities, built straight from inventory records"""
+
+    __slots__ = ("quantities", "display_names", "ids")
+
+    def __init__(self, records=()):
+        self.quantities = {}
+        self.display_names = {}
+        self.ids = {}
+        for record in records:
+            component_id = record["id"]
+            self.quantities[component_id] = self.quantities.get(component_id, 0) + record["quantity"]
+            self.display_names[component_id] = record["display_name"]
+            self.ids[record["display_name"]] = component_id
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def __contains__(self, component_id: int) -> bool:
+        return component_id in self.quantities
+
+    def items(self):
+        """Yields (component_id, display_name, quantity) for every component held"""
+        for component_id, quantity in self.quantities.items():
+            yield component_id, self.display_names[component_id], quantity
+
+    def quantity(self, component_id: int) -> int:
+        return self.quantities.get(component_id, 0)
+
+    def quantity_by_display_name(self, display_name: str) -> int:
+        return self.quantities.get(self.ids.get(display_name), 0)
+
+    def grouped(self, essence_names, common_flora_names) -> tuple[list[tuple[str, int]], list[tuple[str, int]], list[tuple[str, int]]]:
+        """Splits the inventory into essences, common flora and specialty items"""
+        essences = []
+        common_flora = []
+        specialty_items = []
+        for _, display_name, quantity in self.items():
+            if display_name in essence_names:
+                essences.append((display_name, quantity))
+            elif display_name in common_flora_names:
+                common_flora.append((display_name, quantity))
+            else:
+                specialty_items.append((display_name, quantity))
+        return essences, common_flora, specialty_items
@@ -6,6 +6,7 @@ from discord import app_commands, Embed
 from discord.ext import commands
 
 from db import db
+from tracing import traced
 
 
 class Lookup(commands.GroupCog, group_name="lookup"):
@@ -23,109 +24,25 @@ class Lookup(commands.GroupCog, group_name="lookup"):
         await interaction.response.defer(thinking=True)
         role_color = await utils.get_role_color(interaction)
 
-        #user_id = interaction.user.id
-        #player = await db.get_player(user_id, server_id)
-
-        if craft_type == 'Medicine':
-            item = await db.get_medicine_recipe(await utils.sanitize_input(item_name))
-        elif craft_type == 'Alchemy':
-            item = await db.get_alchemy_recipe(await utils.sanitize_input(item_name))
-        else:
+        if craft_type not in ('Medicine', 'Alchemy'):
             await interaction.followup.send("Invalid type specified. Please choose from Medicine, Alchemy")
             return
 
-        title = "Recipe Book"
-
-        embed = Embed(title=title, color=role_color)
-
-        if item:
-            name = item_name
-            stats = None
-            description = None
-            special_requirements = None
-            strength = None
-            boostable = False
-            #duration = "Test"
-            #dice = "Test"
-            #boost = "Test"
-            if craft_type == "Alchemy":
-                description = await db.get_alchemy_description(await utils.sanitize_input(item_name))
-                special_requirements = await db.get_special_requirements(await utils.sanitize_input(item_name))
-                strength = await db.get_alchemy_strength(await utils.sanitize_input(item_name))
-            elif craft_type == "Medicine":
-                description = await db.get_medicine_description(await utils.sanitize_input(item_name))
-                strength = await db.get_medicine_strength(await utils.sanitize_input(item_name))
-                stats = await db.get_medicine_stats(await utils.sanitize_input(item_name))
-                if stats[0]["boost"]:
-                    boostable = True
-
-            item_recipe = await utils.recipe_to_string(item)
-
-            embed = Embed(
-                title=f"{name} {strength}",
-                description=description,
-                color=role_color)
-
-            # TODO: Recipe check code
-            # special_case_tables is imported as sct.
-            item_table = False
-            table_data = ""
-            if name == "Dragon Tea":
-                table_data = sct.dragon_tea_table
-                item_table = True
-            elif name == "Prismatic Balm":
-                table_data = sct.prismatic_balm_table
-                item_table = True
-            elif name == "Draught of Giant's Strength":
-                table_data = sct.giant_strength_table
-                item_table = True
-            elif name == "Mastermind":
-                table_data = sct.mastermind_table
-                item_table = True
-
-            if item_table:
-                embed.add_field(
-                    name="",
-                    value=table_data,
-                    inline=False
-                )
-
-            embed.set_author(name="Recipe Book", icon_url='https://i.imgur.com/hPZLLLe.png')
-            embed.set_thumbnail(url=await utils.get_image_url(item_name))
-
-            embed.add_field(
-                name=f"***Required Components:***",
-                value=item_recipe,
-                inline=True
-            )
-
-            if craft_type == "Medicine" and boostable:
-                if stats[0]['boost']:
-                    if stats[0]['boost'] == "Alchemilla":
-                        boost_effect = "Duration"
-                    elif stats[0]['boost'] == "Ephedra":
-                        boost_effect = "Dice"
-
-                details = (f"**Boost:** {stats[0]['boost'] if stats[0]['boost'] else "None"}\n"
-                           f"**Boost Amount:** {stats[0]['boost_amt'] if stats[0]['boost_amt'] else "None"}\n"
-                           f"**Boost Effects:** {boost_effect}\n")
-                embed.add_field(
-                    name="",
-                    value=details,
-                    inline=True
-                )
-
-            if special_requirements:
-                embed.add_field(
-                    name=f"***Special Requirements***",
-                    value=special_requirements,
-                    inline=False
-                )
-
+        name = await utils.sanitize_input(item_name)
+        cached = recipe_embeds.get((craft_type, name))
+        if cached and cached[0] is db.catalog:
+            embed = cached[1].copy()
         else:
-            name = "Recipe not found."
-            embed.add_field(name=f"{name}", value="", inline=False)
-
+            card = await db.get_recipe_card(craft_type, name)
+            if card and card['recipe']:
+                template = await build_recipe_embed(craft_type, card)
+                recipe_embeds[(craft_type, name)] = (db.catalog, template)
+                embed = template.copy()
+            else:
+                embed = Embed(title="Recipe Book")
+                embed.add_field(name="Recipe not found.", value="", inline=False)
+
+        embed.color = role_color
         await interaction.followup.send(embed=embed)
 
     @app_commands.command(
@@ -137,10 +54,10 @@ class Lookup(commands.GroupCog, group_name="lookup"):
     async def component(self, interaction, component: str):
         await interaction.response.defer(thinking=True)
         role_color = await utils.get_role_color(interaction)
-        component_source = await db.get_component_source(await utils.sanitize_input(component))
-        component_info = await db.get_component_by_name(await utils.sanitize_input(component))
+        dossier = await db.get_component_dossier(await utils.sanitize_input(component))
+        component_source = dossier['sources']
 
-        component_description = component_info['description']
+        component_description = dossier['component']['description']
         source_type = component_source[0]['source_type']  # Creature, Region, CommonTable, Merchant
         amount = component_source[0]['amount']
         source_name = component_source[0]['source_name']
@@ -227,23 +144,9 @@ class Lookup(commands.GroupCog, group_name="lookup"):
             inline=False
         )
 
-        medicines = []
-        alchemy = []
-        boosts = []
-
-        recipes = await db.get_component_recipes(await utils.sanitize_input(component))
-        boosted_medicines = await db.get_boosted_recipes_by_component(await utils.sanitize_input(component))
-        for recipe in recipes:
-            if recipe['medicine']:
-                medicines.append(recipe['medicine'])
-            if recipe['alchemy']:
-                alchemy.append(recipe['alchemy'])
-
-        for medicine in boosted_medicines:
-            boosts.append(medicine['display_name'])
-
-
-
+        medicines = dossier['medicines']
+        alchemy = dossier['alchemy']
+        boosts = dossier['boosts']
 
         if medicines:
             med_column1, med_column2 = await utils.split_list(medicines)
@@ -466,6 +369,45 @@ class Lookup(commands.GroupCog, group_name="lookup"):
 
         await interaction.followup.send(embed=embed)
 
+    @app_commands.command(
+        name="search",
+        description="Search components, recipes, regions and creatures by name."
+    )
+    @app_commands.describe(query="What are you looking for?")
+    async def search(self, interaction, query: str):
+        await interaction.response.defer(thinking=True)
+        color = await utils.get_role_color(interaction)
+        results = db.search_index.search(query)
+
+        embed = Embed(
+            title=f"Search: {query}",
+            color=color
+        )
+        embed.set_author(name="Alchemy Almanac", icon_url='https://i.imgur.com/hPZLLLe.png')
+
+        grouped = {}
+        for kind, name in results:
+            grouped.setdefault(kind, []).append(name)
+
+        titles = {
+            "Component": "Components",
+            "Medicine": "Medicines",
+            "Alchemy": "Alchemical Items",
+            "Region": "Regions",
+            "Creature": "Creatures"
+        }
+        for kind, names in grouped.items():
+            embed.add_field(
+                name=f"**{titles[kind]}**",
+                value="\n".join(names),
+                inline=True
+            )
+
+        if not results:
+            embed.add_field(name="Nothing found.", value="", inline=False)
+
+        await interaction.followup.send(embed=embed)
+
     async def cog_app_command_error(self, interaction, error: app_commands.AppCommandError):
         # Default error message
         message = None
@@ -486,5 +428,88 @@ class Lookup(commands.GroupCog, group_name="lookup"):
         else:
             await interaction.response.send_message(message, ephemeral=True)
 
+# Role-colour independent recipe embeds, keyed by (craft_type, sanitized name) and tagged with the catalog they were built from
+recipe_embeds = {}
+
+
+@traced("render.build_recipe_embed")
+async def build_recipe_embed(craft_type, card) -> Embed:
+    name = card['display_name']
+    stats = None
+    special_requirements = None
+    boostable = False
+
+    if craft_type == "Alchemy":
+        special_requirements = card['special_requirements']
+    elif craft_type == "Medicine":
+        stats = [card]
+        if stats[0]["boost"]:
+            boostable = True
+
+    item_recipe = await utils.recipe_to_string(card['recipe'])
+
+    embed = Embed(
+        title=f"{name} {card['strength']}",
+        description=card['description'])
+
+    # special_case_tables is imported as sct.
+    item_table = False
+    table_data = ""
+    if name == "Dragon Tea":
+        table_data = sct.dragon_tea_table
+        item_table = True
+    elif name == "Prismatic Balm":
+        table_data = sct.prismatic_balm_table
+        item_table = True
+    elif name == "Draught of Giant's Strength":
+        table_data = sct.giant_strength_table
+        item_table = True
+    elif name == "Mastermind":
+        table_data = sct.mastermind_table
+        item_table = True
+
+    if item_table:
+        embed.add_field(
+            name="",
+            value=table_data,
+            inline=False
+        )
+
+    embed.set_author(name="Recipe Book", icon_url='https://i.imgur.com/hPZLLLe.png')
+    embed.set_thumbnail(url=await utils.get_image_url(name))
+
+    embed.add_field(
+        name=f"***Required Components:***",
+        value=item_recipe,
+        inline=True
+    )
+
+    if craft_type == "Medicine" and boostable:
+        if stats[0]['boost']:
+            if stats[0]['boost'] == "Alchemilla":
+                boost_effect = "Duration"
+            elif stats[0]['boost'] == "Ephedra":
+                boost_effect = "Dice"
+
+        details = (f"**Boost:** {stats[0]['boost'] if stats[0]['boost'] else "None"}\n"
+                   f"**Boost Amount:** {stats[0]['boost_amt'] if stats[0]['boost_amt'] else "None"}\n"
+                   f"**Boost Effects:** {boost_effect}\n")
+        embed.add_field(
+            name="",
+            value=details,
+            inline=True
+        )
+
+    if special_requirements:
+        embed.add_field(
+            name=f"***Special Requirements***",
+            value=special_requirements,
+            inline=False
+        )
+
+    return embed
+
+
 async def setup(bot: commands.Bot) -> None:
+    db.catalog_swap_callbacks["lookup.recipe_embeds"] = recipe_embeds.clear
     await bot.add_cog(Lookup(bot))
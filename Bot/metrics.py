@@ -0,0 +1,84 @@
+"""Fixed-size latency histograms"""
+import time
+from bisect import bisect_left
+
+# Bucket upper bounds in seconds, growing by 25% from 50 µs to about a minute
+BUCKETS = tuple(0.00005 * 1.25 ** idx for idx in range(64))
+
+
+class Histogram:
+    """Counts observations into fixed buckets, so memory and cost per observation never grow"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket holding the given fraction of observations"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(BUCKETS[idx], self.max) if idx < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Returns count, mean, p50, p95, p99 and max, with times in milliseconds"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class RollingHistogram:
+    """Percentiles over the last one to two windows, by rotating between two fixed histograms"""
+
+    __slots__ = ("window", "current", "previous", "started")
+
+    def __init__(self, window: float = 300.0):
+        self.window = window
+        self.current = Histogram()
+        self.previous = Histogram()
+        self.started = time.monotonic()
+
+    def _rotate(self) -> None:
+        now = time.monotonic()
+        if now - self.started >= self.window:
+            # After a quiet spell longer than two windows, nothing from before it is recent any more
+            self.previous = self.current if now - self.started < 2 * self.window else Histogram()
+            self.current = Histogram()
+            self.started = now
+
+    def observe(self, seconds: float) -> None:
+        self._rotate()
+        self.current.observe(seconds)
+
+    def merged(self) -> Histogram:
+        self._rotate()
+        merged = Histogram()
+        merged.counts = [a + b for a, b in zip(self.current.counts, self.previous.counts)]
+        merged.count = self.current.count + self.previous.count
+        merged.total = self.current.total + self.previous.total
+        merged.max = max(self.current.max, self.previous.max)
+        return merged
+
+    def summary(self) -> dict[str, float]:
+        return self.merged().summary()
@@ -0,0 +1,60 @@
+"""Schema changes the bot's statements depend on, applied at startup when they are missing"""
+import asyncpg
+
+# The inventory upserts use ON CONFLICT (player_id, component_id), which needs a unique index on exactly that pair
+INVENTORY_KEY_CHECK_SQL = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        WHERE i.indrelid = 'player_inventories'::regclass
+          AND i.indisunique AND i.indpred IS NULL AND i.indexprs IS NULL
+          AND (
+              SELECT array_agg(a.attname::text ORDER BY a.attname::text)
+              FROM pg_attribute a
+              WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+          ) = ARRAY['component_id', 'player_id']
+    );
+"""
+
+# Rows written before the index existed can repeat a (player, component) pair, so they are merged into one row
+# holding their summed quantity before the index is built
+INVENTORY_KEY_MIGRATION_SQL = """
+    LOCK TABLE player_inventories IN SHARE ROW EXCLUSIVE MODE;
+
+    WITH merged AS (
+        DELETE FROM player_inventories
+        WHERE (player_id, component_id) IN (
+            SELECT player_id, component_id
+            FROM player_inventories
+            GROUP BY player_id, component_id
+            HAVING COUNT(*) > 1
+        )
+        RETURNING player_id, component_id, component_quantity
+    )
+    INSERT INTO player_inventories (player_id, component_id, component_quantity)
+    SELECT player_id, component_id, SUM(component_quantity)
+    FROM merged
+    GROUP BY player_id, component_id;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS player_inventories_player_component_key
+    ON player_inventories (player_id, component_id);
+"""
+
+CONNECT_KEYS = ("user", "password", "database", "host", "port")
+
+
+async def ensure_inventory_key(config: dict[str, any]) -> bool:
+    """Adds the player_inventories (player_id, component_id) unique index if it is missing
+
+    Runs on its own connection before the pool is created, so no pooled connection prepares the upserts first.
+    Returns True if the index had to be created.
+    """
+    conn = await asyncpg.connect(**{key: config[key] for key in CONNECT_KEYS})
+    try:
+        if await conn.fetchval(INVENTORY_KEY_CHECK_SQL):
+            return False
+        async with conn.transaction():
+            await conn.execute(INVENTORY_KEY_MIGRATION_SQL)
+        return True
+    finally:
+        await conn.close()
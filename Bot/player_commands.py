@@ -17,19 +17,18 @@ class PlayerCommands(commands.Cog):
     @app_commands.autocomplete(component=utils.component_autocompletion)
     @app_commands.describe(component="Which item?", quantity="How much?")
     async def add(self, interaction, component: str, quantity: int):
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        player = await db.get_player(db_unique_player_id, db_unique_server_id)
+        await interaction.response.defer(thinking=True)
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
 
         if not player:
-            await interaction.response.send_message(f"You dont have an inventory, {str(interaction.user.display_name)}! Are you even in this game?!!")
+            await interaction.followup.send(f"You dont have an inventory, {str(interaction.user.display_name)}! Are you even in this game?!!")
             return
 
         if response := await utils.validate_components(component, quantity):
-            return await interaction.response.send_message(response)
+            return await interaction.followup.send(response)
 
-        await db.add_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component), quantity)
-        await interaction.response.send_message(f"Added {quantity} {component} to {player["character_name"]}'s inventory!")
+        await db.add_player_inventory_item(db_unique_player_id, db.component_index.get_by_display_name(component)['id'], quantity)
+        await interaction.followup.send(f"Added {quantity} {component} to {player["character_name"]}'s inventory!")
 
     @app_commands.command(
         name="sub",
@@ -38,32 +37,27 @@ class PlayerCommands(commands.Cog):
     @app_commands.autocomplete(component=utils.component_autocompletion)
     @app_commands.describe(component="Which item?", quantity="How much?")
     async def sub(self, interaction, component: str, quantity: int):
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        player = await db.get_player(db_unique_player_id, db_unique_server_id)
+        await interaction.response.defer(thinking=True)
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
 
         if not player:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"{str(interaction.user.display_name)}... why are you trying to remove items when you dont even have an inventory to store them in...")
             return
 
         if response := await utils.validate_components(component, quantity):
-            return await interaction.response.send_message(response)
+            return await interaction.followup.send(response)
 
-        player_inventory = await db.get_player_inventory(db_unique_player_id)
-        has_item, amount = await utils.check_inventory(player_inventory, component)
+        remaining = await db.sub_player_inventory_item(db_unique_player_id, db.component_index.get_by_display_name(component)['id'], quantity)
 
-        if has_item:
-            if amount - quantity <= 0:
-                await db.delete_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component))
-                response = f"All {component} removed from {player["character_name"]}'s inventory!"
-            else:
-                await db.sub_player_inventory_item(db_unique_player_id, await utils.sanitize_input(component), quantity)
-                response = f"Removed {quantity} {component} to {player["character_name"]}'s inventory!"
-        else:
+        if remaining is None:
             response = f"You dont have any {component} in your inventory {player["character_name"]}! Go find some!"
+        elif remaining == 0:
+            response = f"All {component} removed from {player["character_name"]}'s inventory!"
+        else:
+            response = f"Removed {quantity} {component} to {player["character_name"]}'s inventory!"
 
-        await interaction.response.send_message(response)
+        await interaction.followup.send(response)
 
     @app_commands.command(
         name="inventory",
@@ -73,14 +67,9 @@ class PlayerCommands(commands.Cog):
         await interaction.response.defer(thinking=True)
         role_color = await utils.get_role_color(interaction)
 
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        player = await db.get_player(db_unique_player_id, db_unique_server_id)
+        db_unique_server_id, db_unique_player_id, player = await db.resolve_player(interaction.guild.id, interaction.user.id)
 
         player_inventory = await db.get_player_inventory(db_unique_player_id)
-        essences = []
-        common_flora = []
-        specialty_items = []
 
         if not player:
             await interaction.followup.send(f"You don't have an inventory {str(interaction.user.display_name)}! Are you even a player?")
@@ -96,13 +85,10 @@ class PlayerCommands(commands.Cog):
         embed = Embed(title=title, color=role_color)
         embed.set_author(name=player["character_name"], icon_url=interaction.user.display_avatar.url)
 
-        for item in player_inventory:
-            if item["display_name"] in utils.essence_names:
-                essences.append(f"{item["display_name"]}: {item["quantity"]}")
-            elif item["display_name"] in utils.common_flora_names:
-                common_flora.append(f"{item["display_name"]}: {item["quantity"]}")
-            else:
-                specialty_items.append(f"{item["display_name"]}: {item["quantity"]}")
+        essences, common_flora, specialty_items = (
+            [f"{display_name}: {quantity}" for display_name, quantity in group]
+            for group in player_inventory.grouped(utils.essence_names, utils.common_flora_names)
+        )
 
         embed.add_field(
             name="Essences",
@@ -127,45 +113,63 @@ class PlayerCommands(commands.Cog):
     )
     @app_commands.autocomplete(username=utils.player_autocompletion)
     @app_commands.autocomplete(component=utils.component_autocompletion)
-    @app_commands.describe(username="Giving to?", component="Which item?", quantity="How much?")
-    async def transfer(self, interaction, username: str, component: str, quantity: int):
-        db_unique_server_id = await db.get_server_database_id(interaction.guild.id)
-        owner_db_unique_player_id = await db.get_player_database_id(interaction.user.id, db_unique_server_id)
-        owning_player = await db.get_player(owner_db_unique_player_id, db_unique_server_id)
+    @app_commands.autocomplete(component_2=utils.component_autocompletion)
+    @app_commands.autocomplete(component_3=utils.component_autocompletion)
+    @app_commands.describe(username="Giving to?", component="Which item?", quantity="How much?",
+                           component_2="Another item, for splitting loot in one go", quantity_2="How much of it?",
+                           component_3="A third item", quantity_3="How much of it?")
+    async def transfer(self, interaction, username: str, component: str, quantity: int,
+                       component_2: str = None, quantity_2: int = None, component_3: str = None, quantity_3: int = None):
+        await interaction.response.defer(thinking=True)
+        db_unique_server_id, owner_db_unique_player_id, owning_player = await db.resolve_player(interaction.guild.id, interaction.user.id)
         if not owning_player:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"You don't have an inventory {str(interaction.user.display_name)}! What are you trying to give away?!")
             return
 
-        owning_player_inventory = await db.get_player_inventory(owner_db_unique_player_id)
-        owner_has_item, owner_amount = await utils.check_inventory(owning_player_inventory, component)
-
         target_player_display_name, target_player_db_unique_id, db_unique_server_id = await utils.split_player_autocomplete_return_value(username)
 
         target_player_character = await db.get_player(target_player_db_unique_id, db_unique_server_id)
         if target_player_db_unique_id == 0 or  db_unique_server_id == 0:
-            await interaction.response.send_message(f"{target_player_display_name} is not a player.")
-            return
-
-        if response := await utils.validate_components(component, quantity):
-            return await interaction.response.send_message(response)
-
-        if not owner_has_item:
-            await interaction.response.send_message(
-                f"You do not have any {component} in your inventory, {interaction.user.display_name}! You should probably go get some more.")
+            await interaction.followup.send(f"{target_player_display_name} is not a player.")
             return
 
-        if (owner_amount - quantity) < 0:
-            await interaction.response.send_message(f"You don't have {quantity} {component} to transfer. Quit trying to cheat {interaction.user.display_name}!")
-            return
-
-        if (owner_amount - quantity) == 0:
-            await db.delete_player_inventory_item(owner_db_unique_player_id, await utils.sanitize_input(component))
+        components = {}
+        component_names = {}
+        for name, amount in ((component, quantity), (component_2, quantity_2), (component_3, quantity_3)):
+            if name is None:
+                continue
+            if amount is None:
+                return await interaction.followup.send(f"How many {name} are you giving?")
+            if response := await utils.validate_components(name, amount):
+                return await interaction.followup.send(response)
+            component_id = db.component_index.get_by_display_name(name)['id']
+            components[component_id] = components.get(component_id, 0) + amount
+            component_names[component_id] = name
+
+        # Every item moves in the same transaction, so a loot split happens in full or not at all
+        if len(components) == 1:
+            transferred, shortfall = await db.transfer_items(
+                owner_db_unique_player_id, target_player_db_unique_id, *next(iter(components.items())))
         else:
-            await db.sub_player_inventory_item(owner_db_unique_player_id, await utils.sanitize_input(component), quantity)
+            transferred, shortfall = await db.transfer_items_bulk(
+                owner_db_unique_player_id, target_player_db_unique_id, components)
+
+        if not transferred:
+            if len(components) > 1:
+                missing = ", ".join(
+                    f"{item['required']} {component_names[item['component_id']]} (you have {item['available']})"
+                    for item in shortfall)
+                await interaction.followup.send(f"You don't have {missing} to transfer, {interaction.user.display_name}. Nothing was given.")
+            elif shortfall[0]['available'] == 0:
+                await interaction.followup.send(
+                    f"You do not have any {component} in your inventory, {interaction.user.display_name}! You should probably go get some more.")
+            else:
+                await interaction.followup.send(f"You don't have {components[shortfall[0]['component_id']]} {component} to transfer. Quit trying to cheat {interaction.user.display_name}!")
+            return
 
-        await db.add_player_inventory_item(target_player_db_unique_id, await utils.sanitize_input(component),quantity)
-        await interaction.response.send_message(f"Successfully transferred {quantity} {component} to {target_player_character['character_name']}!")
+        given = ", ".join(f"{amount} {component_names[component_id]}" for component_id, amount in components.items())
+        await interaction.followup.send(f"Successfully transferred {given} to {target_player_character['character_name']}!")
 
     async def cog_app_command_error(self, interaction, error: app_commands.AppCommandError):
         # Default error message
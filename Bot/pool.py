@@ -0,0 +1,118 @@
+"""Configurable asyncpg pool with acquire-wait and per-statement instrumentation"""
+import os
+import time
+import asyncpg
+import traceback
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from instrumentation import record_acquire_wait
+from metrics import Histogram
+
+
+def _env_number(name: str, default, cast):
+    value = os.getenv(name)
+    return cast(value) if value else default
+
+
+def pool_config() -> dict[str, any]:
+    """Reads connection and pool settings from the environment, defaulting to the original hard-coded values"""
+    return {
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASS"),
+        "database": os.getenv("DB_NAME", "botdb"),
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": _env_number("DB_PORT", 5432, int),
+        "min_size": _env_number("DB_POOL_MIN_SIZE", 1, int),
+        "max_size": _env_number("DB_POOL_MAX_SIZE", 5, int),
+        "max_queries": _env_number("DB_POOL_MAX_QUERIES", 50000, int),
+        "max_inactive_connection_lifetime": _env_number("DB_POOL_MAX_INACTIVE_LIFETIME", 300.0, float),
+        "command_timeout": _env_number("DB_COMMAND_TIMEOUT", None, float),
+        "statement_cache_size": _env_number("DB_STATEMENT_CACHE_SIZE", 100, int)
+    }
+
+
+class InstrumentedPool:
+    """Wraps an asyncpg pool, timing how long callers wait for a connection and how long each statement runs"""
+
+    def __init__(self, hot_statements: dict[str, tuple[str, tuple]]):
+        self.pool = None
+        self.warm = True
+        self.hot_statements = hot_statements
+        self.statement_names = {sql: name for name, (sql, _) in hot_statements.items()}
+        self.acquire_wait = Histogram()
+        self.statements = defaultdict(Histogram)
+        self.statement_errors = defaultdict(int)
+        self.in_use = 0
+        self.waiting = 0
+
+    async def create(self, **config) -> None:
+        # Without a statement cache there is nothing for the warm-up to fill
+        self.warm = config.get("statement_cache_size", 100) > 0
+        self.pool = await asyncpg.create_pool(init=self._init_connection, **config)
+
+    async def _init_connection(self, conn) -> None:
+        if self.warm:
+            await self._warm_statements(conn)
+        conn.add_query_logger(self._log_query)
+
+    async def _warm_statements(self, conn) -> None:
+        # Running each hot statement once, with arguments that match no rows and inside a transaction that is
+        # rolled back, leaves it parsed and planned in the connection's statement cache
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            for sql, args in self.hot_statements.values():
+                await conn.fetch(sql, *args)
+        except asyncpg.PostgresError:
+            traceback.print_exc()
+        finally:
+            await transaction.rollback()
+
+    def _log_query(self, record) -> None:
+        name = self.statement_names.get(record.query) or " ".join(record.query.split())[:80]
+        self.statements[name].observe(record.elapsed)
+        if record.exception is not None:
+            self.statement_errors[name] += 1
+
+    @asynccontextmanager
+    async def acquire(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire()
+        finally:
+            self.waiting -= 1
+        wait = time.perf_counter() - start
+        self.acquire_wait.observe(wait)
+        record_acquire_wait(wait)
+
+        self.in_use += 1
+        try:
+            yield conn
+        finally:
+            self.in_use -= 1
+            await self.pool.release(conn)
+
+    def stats(self) -> dict[str, any]:
+        """Returns pool gauges, the acquire-wait histogram and per-statement timings, slowest total first"""
+        statements = sorted(self.statements.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "acquire_wait": self.acquire_wait.summary(),
+            "statements": {
+                name: {**histogram.summary(), "errors": self.statement_errors[name]}
+                for name, histogram in statements
+            }
+        }
+
+    def __getattr__(self, name):
+        # Everything else (close, get_size, ...) goes straight to the wrapped pool
+        if name == "pool":
+            raise AttributeError(name)
+        return getattr(self.pool, name)
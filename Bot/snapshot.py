@@ -0,0 +1,42 @@
+"""Versioned, checksummed on-disk snapshot of the catalog and its indexes"""
+import hashlib
+import os
+import pickle
+import struct
+
+MAGIC = b"HGCATSNP"
+# Bump whenever the catalog classes change shape, so old snapshots are rebuilt instead of unpickled
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">8sH32s")
+
+
+def save_snapshot(path: str, version: str, catalog: dict[str, any]) -> int:
+    """Writes the catalog atomically and returns the snapshot size in bytes"""
+    body = pickle.dumps({"version": version, "catalog": catalog}, protocol=pickle.HIGHEST_PROTOCOL)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, hashlib.sha256(body).digest()))
+        file.write(body)
+    os.replace(temp_path, path)
+    return HEADER.size + len(body)
+
+
+def load_snapshot(path: str) -> dict[str, any] | None:
+    """Returns {"version", "catalog"}, or None if the snapshot is missing, from another format or corrupt"""
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    magic, format_version, checksum = HEADER.unpack_from(data)
+    body = memoryview(data)[HEADER.size:]
+    if magic != MAGIC or format_version != FORMAT_VERSION or hashlib.sha256(body).digest() != checksum:
+        return None
+
+    try:
+        return pickle.loads(body)
+    except Exception:
+        return None
@@ -0,0 +1,16 @@
+"""Timing for the startup pipeline and catalog reloads"""
+import time
+from contextlib import contextmanager
+
+# Phase name -> seconds taken by its most recent run
+phase_timings = {}
+
+
+@contextmanager
+def phase(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_timings[name] = time.perf_counter() - start
+        print(f"[Timing] {name}: {phase_timings[name] * 1000:.1f} ms")
@@ -0,0 +1,148 @@
+"""Per-interaction latency tracing across database calls, rendering and Discord HTTP requests"""
+import functools
+import os
+import time
+import discord
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from discord import app_commands
+
+# Completed traces, oldest dropped first
+recent_traces = deque(maxlen=int(os.getenv("TRACE_BUFFER_SIZE", "500")))
+
+current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "start", "duration", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.children = []
+
+    def breakdown(self) -> dict[str, tuple[int, float]]:
+        """Returns {kind: (spans, seconds)} over the direct children, grouped by the prefix before the first dot"""
+        kinds = {}
+        for child in self.children:
+            kind = child.name.split(".", 1)[0]
+            count, seconds = kinds.get(kind, (0, 0.0))
+            kinds[kind] = (count + 1, seconds + child.duration)
+        return kinds
+
+
+@contextmanager
+def span(name: str):
+    """Times a step as a child of the current span; does nothing outside a traced interaction"""
+    parent = current_span.get()
+    if parent is None:
+        yield
+        return
+
+    child = Span(name)
+    parent.children.append(child)
+    token = current_span.set(child)
+    try:
+        yield
+    finally:
+        current_span.reset(token)
+        child.duration = time.perf_counter() - child.start
+
+
+def traced(name: str):
+    """Decorates a coroutine function so each call is a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Option types that name a subcommand rather than carry a value
+SUBCOMMAND_TYPES = (discord.AppCommandOptionType.subcommand.value, discord.AppCommandOptionType.subcommand_group.value)
+
+
+def command_name(data: dict) -> str:
+    """The invoked command's full name, following any subcommand group and subcommand through the options"""
+    parts = [data.get("name", "unknown")]
+    options = data.get("options", [])
+    while options and options[0].get("type") in SUBCOMMAND_TYPES:
+        parts.append(options[0]["name"])
+        options = options[0].get("options", [])
+    return " ".join(parts)
+
+
+class TracedCommandTree(app_commands.CommandTree):
+    """Opens a root span for every app command interaction and keeps it in the ring buffer once it finishes
+
+    interaction_check starts the trace before the command is resolved; the app_command_completion event or on_error
+    ends it.
+    """
+
+    def __init__(self, client, *args, **kwargs):
+        super().__init__(client, *args, **kwargs)
+        if hasattr(client, "add_listener"):
+            client.add_listener(self.on_app_command_completion)
+
+    async def interaction_check(self, interaction) -> bool:
+        if interaction.type is discord.InteractionType.application_command:
+            root = Span(f"/{command_name(interaction.data)}")
+            interaction.extras["trace"] = root
+            # interaction_check is awaited inside the interaction's own task, so the span stays current for the command
+            current_span.set(root)
+        return await super().interaction_check(interaction)
+
+    @staticmethod
+    def finish_trace(interaction) -> None:
+        root = interaction.extras.pop("trace", None)
+        if root is not None:
+            root.duration = time.perf_counter() - root.start
+            recent_traces.append(root)
+
+    async def on_app_command_completion(self, interaction, command) -> None:
+        self.finish_trace(interaction)
+
+    async def on_error(self, interaction, error) -> None:
+        self.finish_trace(interaction)
+        await super().on_error(interaction, error)
+
+
+def slowest_traces(limit: int = 5) -> list[Span]:
+    return sorted(recent_traces, key=lambda trace: trace.duration, reverse=True)[:limit]
+
+
+# discord.py versions whose HTTPClient.request and AsyncWebhookAdapter.request take the Route first
+HTTP_SPAN_VERSIONS = ((2, 0), (3, 0))
+
+
+def install_http_spans() -> None:
+    """Times every Discord REST and interaction-webhook request as an http span
+
+    There is no public hook for outgoing requests, so this wraps the two request methods. It only does so on the
+    discord.py versions they were checked against, and skips any class that no longer has the method.
+    """
+    if not HTTP_SPAN_VERSIONS[0] <= tuple(discord.version_info[:2]) < HTTP_SPAN_VERSIONS[1]:
+        print(f"[Tracing] HTTP spans disabled on discord.py {discord.__version__}")
+        return
+
+    from discord.http import HTTPClient
+    from discord.webhook.async_ import AsyncWebhookAdapter
+
+    for cls in (HTTPClient, AsyncWebhookAdapter):
+        if not hasattr(cls, "request") or getattr(cls.request, "__traced__", False):
+            continue
+
+        def wrap(request):
+            @functools.wraps(request)
+            async def traced_request(self, route, *args, **kwargs):
+                with span(f"http.{route.method} {route.path}"):
+                    return await request(self, route, *args, **kwargs)
+            traced_request.__traced__ = True
+            return traced_request
+
+        cls.request = wrap(cls.request)
@@ -1,33 +1,48 @@
 """Miscellaneous utility functions"""
 import discord
 import typing
-import json
 import math
 
 from discord import app_commands
 
+from catalog import PrefixIndex
 from db import db
 
-with open('images.json', 'r') as file:
-    images = json.load(file)
-
-
 essence_names = ["Earth", "Fire", "Air", "Water", "Ice", "Lightning"]
 common_flora_names = ["Alchemilla", "Deadly Nightshade", "Ephedra", "Fleshwort", "Juniper Berries", "Willow Bark"]
 creature_bases = ['Aberrations', 'Celestials', 'Dragons', 'Fey', 'Fiends', 'Giants', 'Humanoids', 'Monstrosities', 'Oozes', 'Undead']
 
 
+# Per-guild caches: guild id -> {member id: colour} and guild id -> {role name: role ids}
+role_colors = {}
+role_ids = {}
+
+
 def has_role(role_name: str):
     async def predicate(interaction) -> bool:
-        return any(role.name == role_name for role in interaction.user.roles)
+        if interaction.guild is None:
+            return any(role.name == role_name for role in interaction.user.roles)
+        names = role_ids.get(interaction.guild.id)
+        if names is None:
+            names = {}
+            for role in interaction.guild.roles:
+                names.setdefault(role.name, set()).add(role.id)
+            role_ids[interaction.guild.id] = names
+        return any(interaction.user.get_role(role_id) for role_id in names.get(role_name, ()))
 
     return app_commands.check(predicate)
 
+
+def invalidate_member_roles(guild_id: int, member_id: int) -> None:
+    role_colors.get(guild_id, {}).pop(member_id, None)
+
+
+def invalidate_guild_roles(guild_id: int) -> None:
+    role_colors.pop(guild_id, None)
+    role_ids.pop(guild_id, None)
+
 async def get_image_url(item_name):
-    for item in images:
-        if item['name'] == item_name:
-            return item['url']
-    return None
+    return db.image_urls.get(item_name)
 
 
 async def recipe_to_string(
@@ -65,6 +80,10 @@ async def sanitize_input(input_string: str) -> str:
 
 async def get_role_color(interaction):
     """Grabs the role color for any custom role"""
+    colors = role_colors.setdefault(interaction.guild.id, {}) if interaction.guild else {}
+    if interaction.user.id in colors:
+        return colors[interaction.user.id]
+
     role_color = discord.Color.default()
     if interaction.user.roles:
         colored_roles = [role for role in sorted(interaction.user.roles, key=lambda r: r.position, reverse=True) if
@@ -72,18 +91,17 @@ async def get_role_color(interaction):
         if colored_roles:
             role_color = colored_roles[0].color
 
+    colors[interaction.user.id] = role_color
     return role_color
 
 
 async def check_inventory(player_inventory, component):
     """Checks if an item exists in players inventory"""
-    quantity = None
+    quantity = player_inventory.quantity_by_display_name(component)
+    if quantity:
+        return True, quantity
 
-    for item in player_inventory:
-        if item["display_name"] == component:
-            return True, item['quantity']
-
-    return False, quantity
+    return False, None
 
 
 async def split_ingredients(recipe):
@@ -123,22 +141,37 @@ async def get_display_name(interaction, user_id) -> str:
 
 
 async def component_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
-    data = []
-    for component in db.components:
-        if (component["display_name"].lower().startswith(current) or component["display_name"].startswith(current)) and len(data) < 25:
-            data.append(app_commands.Choice(name=component["display_name"], value=component["display_name"]))
-    return data
+    return [app_commands.Choice(name=name, value=name) for name in db.search_index.names(current, "Component")]
+
+
+async def get_roster(guild, server_database_id: int) -> dict:
+    """Returns the server's registered players keyed by display name, building and caching it on first use"""
+    roster = db.rosters.get(server_database_id)
+    if roster is None:
+        players = {}
+        for player in await db.get_all_players(server_database_id):
+            member = guild.get_member(player["user_id"])
+            if member is None:
+                continue
+            players.setdefault(member.display_name, []).append({
+                "id": player["id"],
+                "user_id": player["user_id"],
+                "character_name": player["character_name"],
+                "display_name": member.display_name
+            })
+        roster = {"players": players, "index": PrefixIndex(players)}
+        db.rosters[server_database_id] = roster
+    return roster
 
 
 async def player_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
     server_database_id = await db.get_server_database_id(interaction.guild.id)
-    players = await db.get_all_players(server_database_id)
+    roster = await get_roster(interaction.guild, server_database_id)
     data = []
-    for player in players:
-        display_name = await get_display_name(interaction, player["user_id"])
-        if (display_name.lower().startswith(current) or display_name.startswith(current)) and len(data) < 25:
+    for display_name in roster["index"].search(current):
+        for player in roster["players"][display_name]:
             data.append(app_commands.Choice(name=display_name, value=f"{display_name}|{player["id"]}|{server_database_id}"))
-    return data
+    return data[:25]
 
 
 async def discord_member_autocompletion(interaction, current: str):
@@ -161,29 +194,19 @@ async def dm_autocompletion(interaction, current: str):
 
 
 async def craft_recipe_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
-    data = []
     craft_type = str(interaction.namespace.craft_type)
-
-    if craft_type == "Medicine":
-        for medicine in db.medicines:
-            if (medicine["display_name"].lower().startswith(current) or medicine["display_name"].startswith(current)) and len(data) < 25:
-                data.append(app_commands.Choice(name=medicine["display_name"], value=medicine["display_name"]))
-    if craft_type == "Alchemy":
-        for alchemical_item in db.alchemical_items:
-            if (alchemical_item["display_name"].lower().startswith(current) or alchemical_item["display_name"].startswith(current)) and len(data) < 25:
-                data.append(app_commands.Choice(name=alchemical_item["display_name"], value=alchemical_item["display_name"]))
-    return data
+    if craft_type not in ("Medicine", "Alchemy"):
+        return []
+    return [app_commands.Choice(name=name, value=name) for name in db.search_index.names(current, craft_type)]
 
 
 async def find_available_ingredients(player_inventory, swappable_ingredients):
-    """Returns any ingredients that the recipe requires that the player has"""
-    inventory_dict = {item['display_name']: item['quantity'] for item in player_inventory}
-
+    """Returns (ingredient, quantity held) for every ingredient the recipe requires that the player has"""
     available_ingredients = []
     for item in swappable_ingredients:
-        if item['display_name'] in inventory_dict:
-            for _ in range(inventory_dict[item['display_name']]):
-                available_ingredients.append(item)
+        quantity = player_inventory.quantity(item['id'])
+        if quantity:
+            available_ingredients.append((item, quantity))
 
     return tuple(available_ingredients)
 
@@ -197,12 +220,7 @@ async def type_autocompletion(interaction, current: str) -> typing.List[app_comm
 
 
 async def region_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
-    regions = db.regions
-    data = []
-    for region in regions:
-        if region['name'].lower().startswith(current) or region['name'].startswith(current):
-            data.append(app_commands.Choice(name=region['name'], value=region['name']))
-    return data
+    return [app_commands.Choice(name=name, value=name) for name in db.search_index.names(current, "Region")]
 
 
 async def creature_base_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
@@ -214,11 +232,10 @@ async def creature_base_autocompletion(interaction, current: str) -> typing.List
 
 
 async def creature_name_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
-    avail_creatures = await db.get_creatures_by_creature_base(str(interaction.namespace.base))
-    data = []
-    for creature in avail_creatures:
-        data.append(app_commands.Choice(name=creature['creature_name'], value=creature['creature_name']))
-    return data
+    return [
+        app_commands.Choice(name=name, value=name)
+        for name in db.creature_index.search(str(interaction.namespace.base), current)
+    ]
 
 
 async def common_table_autocompletion(interaction, current: str) -> typing.List[app_commands.Choice[str]]:
@@ -253,7 +270,7 @@ async def validate_player_and_components(username, component, quantity):
     if quantity < 0:
         return None, None, None, "Don't use negative numbers."
 
-    if component not in [c["display_name"] for c in db.components]:
+    if db.component_index.get_by_display_name(component) is None:
         return None, None, None, "That component doesn't exist."
 
     return user_display_name, db_unique_player_id, player, None
@@ -263,6 +280,6 @@ async def validate_components(component, quantity):
     if quantity < 0:
         return "Don't use negative numbers."
 
-    if component not in [c["display_name"] for c in db.components]:
+    if db.component_index.get_by_display_name(component) is None:
         return "That component doesn't exist."
 
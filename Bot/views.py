@@ -0,0 +1,117 @@
+"""Lifecycle management for long-lived interactive views"""
+import os
+import sys
+import time
+import dotenv
+import discord
+
+from collections import OrderedDict
+from discord.ext import tasks
+from discord.ui import View
+
+dotenv.load_dotenv()
+
+# Persistent views keep their state in component custom_ids instead of in memory, so nothing is held per
+# message and their components keep working across restarts and cog reloads
+PERSISTENT_VIEWS = os.getenv("PERSISTENT_VIEWS", "true").lower() in ("1", "true", "yes")
+
+CRAFT_TYPE_CODES = {"Medicine": "M", "Alchemy": "A"}
+CRAFT_TYPES = {code: craft_type for craft_type, code in CRAFT_TYPE_CODES.items()}
+
+
+class ViewRegistry:
+    """Caps how many views stay live, evicting the least recently used, idle or over-limit ones"""
+
+    def __init__(self, max_views: int = 500, max_per_user: int = 5, idle_ttl: float = 900):
+        self.max_views = max_views
+        self.max_per_user = max_per_user
+        self.idle_ttl = idle_ttl
+        # view -> [author_id, followup webhook, last_used]; the webhook is all that's needed to edit the original
+        # response, so the interaction itself (guild, member, message, payload) isn't kept alive with the view
+        self._views = OrderedDict()
+        self.evictions = 0
+
+    async def register(self, view: View, interaction) -> None:
+        """Tracks a view once it has been sent as the interaction's original response"""
+        self._views[view] = [interaction.user.id, interaction.followup, time.monotonic()]
+        if not self.sweep.is_running():
+            self.sweep.start()
+        await self._evict_idle()
+
+        user_views = [tracked for tracked, entry in self._views.items() if entry[0] == interaction.user.id]
+        for tracked in user_views[:-self.max_per_user]:
+            await self.evict(tracked)
+
+        while len(self._views) > self.max_views:
+            await self.evict(next(iter(self._views)))
+
+    @tasks.loop(seconds=60)
+    async def sweep(self) -> None:
+        # Idle views are also evicted when nothing new is registered for a while
+        await self._evict_idle()
+
+    def touch(self, view: View) -> None:
+        if view in self._views:
+            self._views[view][2] = time.monotonic()
+            self._views.move_to_end(view)
+
+    def discard(self, view: View) -> None:
+        self._views.pop(view, None)
+
+    async def evict(self, view: View) -> None:
+        """Stops a view and disables its components on the message it is attached to"""
+        entry = self._views.pop(view, None)
+        if entry is None:
+            return
+        self.evictions += 1
+
+        for item in view.children:
+            if hasattr(item, "disabled"):
+                item.disabled = True
+        view.stop()
+
+        try:
+            await entry[1].edit_message("@original", view=view)
+        except discord.HTTPException:
+            # The interaction token only lasts 15 minutes; the view is out of the store either way
+            pass
+
+    async def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._views:
+            view, entry = next(iter(self._views.items()))
+            if entry[2] > cutoff:
+                break
+            await self.evict(view)
+
+    @staticmethod
+    def estimate_bytes(view: View, webhook=None) -> int:
+        size = sys.getsizeof(view) + sys.getsizeof(view.__dict__)
+        for item in view.children:
+            size += sys.getsizeof(item) + sys.getsizeof(item.__dict__)
+        for embed in getattr(view, "embeds", ()):
+            size += sys.getsizeof(embed) + len(embed)
+        if webhook is not None:
+            size += sys.getsizeof(webhook) + sys.getsizeof(webhook.token)
+        return size
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "live_views": len(self._views),
+            "estimated_bytes": sum(self.estimate_bytes(view, entry[1]) for view, entry in self._views.items()),
+            "evictions": self.evictions
+        }
+
+
+view_registry = ViewRegistry()
+
+
+class TrackedView(View):
+    """A View that keeps its place in the registry fresh and leaves it when it times out"""
+
+    async def interaction_check(self, interaction) -> bool:
+        view_registry.touch(self)
+        return True
+
+    async def on_timeout(self) -> None:
+        view_registry.discard(self)
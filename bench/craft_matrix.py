@@ -0,0 +1,64 @@
+"""Party craftability throughput: CraftMatrix for 1,000 players x 500 recipes against one possible_crafts per player
+
+The fixture is 500 synthetic recipes of one to four component groups, each offering one to four of 300 components,
+and 1,000 inventories of 50 components each. party_crafts answers every player at once. Its time is split into
+building the inventory matrix and the NumPy max_crafts evaluation, and the one-off matrix build is shown separately.
+The baseline runs possible_crafts once per player over the same inventories. Times are the best of several runs in
+milliseconds for the whole party, with players per second alongside; the speedup is the per-player loop divided by
+party_crafts.
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+from catalog import RecipeCatalog
+
+PLAYERS = 1_000
+RECIPES = 500
+COMPONENTS = 300
+INVENTORY_LINES = 50
+
+
+def synthetic_catalog(rng: random.Random) -> RecipeCatalog:
+    items = [{"id": idx + 1, "name": f"recipe_{idx + 1}", "display_name": f"Recipe {idx + 1}"} for idx in range(RECIPES)]
+    rows = [
+        {"recipe": item["name"], "component_number": component_number, "id": component_id, "quantity": quantity}
+        for item in items
+        for component_number, quantity in ((number, rng.randint(1, 3)) for number in range(1, rng.randint(1, 4) + 1))
+        for component_id in rng.sample(range(1, COMPONENTS + 1), rng.randint(1, 4))
+    ]
+    return RecipeCatalog(items, items, rows, rows)
+
+
+def main():
+    rng = random.Random(7)
+    catalog = synthetic_catalog(rng)
+    inventories = [
+        {component_id: rng.randint(1, 6) for component_id in rng.sample(range(1, COMPONENTS + 1), INVENTORY_LINES)}
+        for _ in range(PLAYERS)
+    ]
+
+    matrix_build = timeit.timeit(lambda: catalog.craft_matrix("Medicine"), number=1)
+    matrix = catalog.craft_matrix("Medicine")
+    inventory_matrix = matrix.inventory_matrix(inventories)
+
+    party = min(timeit.repeat(lambda: catalog.party_crafts("Medicine", inventories), number=1, repeat=5))
+    inventory_only = min(timeit.repeat(lambda: matrix.inventory_matrix(inventories), number=1, repeat=5))
+    evaluate = min(timeit.repeat(lambda: matrix.max_crafts(inventory_matrix), number=1, repeat=5))
+    per_player = min(timeit.repeat(
+        lambda: [catalog.possible_crafts("Medicine", inventory) for inventory in inventories], number=1, repeat=3))
+
+    print(f"{PLAYERS:,} players x {RECIPES} recipes, {INVENTORY_LINES} inventory lines each")
+    print(f"  matrix build (once)      {matrix_build * 1000:8.2f} ms")
+    print(f"  party_crafts             {party * 1000:8.2f} ms  ({PLAYERS / party:10,.0f} players/s)")
+    print(f"    inventory matrix       {inventory_only * 1000:8.2f} ms")
+    print(f"    max_crafts (NumPy)     {evaluate * 1000:8.2f} ms")
+    print(f"  possible_crafts x {PLAYERS:,}  {per_player * 1000:8.2f} ms  ({PLAYERS / per_player:10,.0f} players/s)")
+    print(f"  speedup                  {per_player / party:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
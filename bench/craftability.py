@@ -0,0 +1,155 @@
+"""One player's craftable medicines: the in-memory engines against the recipe CTE, at 500 recipes x 50 lines
+
+The fixture is 500 synthetic medicines of one to four component groups, each offering one to four of 300
+components, and 200 players holding 50 components each. For every player the bench answers "what can I craft and
+how many times" four ways:
+
+  possible_crafts       RecipeCatalog.possible_crafts on the player's {component_id: quantity}, no I/O
+  craft matrix          CraftMatrix over the same inventory as a one-row party
+  fetch + possible      INVENTORY_QUANTITIES_SQL and possible_crafts, what get_player_possible_medicines now does
+  recipe CTE            POSSIBLE_MEDICINES_SQL, the query it replaced, without its per-row get_medicine_recipe calls
+
+The last two need Postgres, reached through the bot's DB_* variables; the fixture is loaded into temporary tables
+that shadow the real ones on the bench's own connection. Without a database those rows report why they were
+skipped. Each row gives mean and p95 microseconds per player; the CTE rows also confirm both paths agree.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+import asyncpg
+
+from catalog import RecipeCatalog
+from db import INVENTORY_QUANTITIES_SQL, POSSIBLE_MEDICINES_SQL
+from migrations import CONNECT_KEYS
+from pool import pool_config
+
+RECIPES = 500
+COMPONENTS = 300
+INVENTORY_LINES = 50
+PLAYERS = 200
+
+
+def fixture(rng: random.Random):
+    medicines = [{"id": idx + 1, "name": f"medicine_{idx + 1}", "display_name": f"Medicine {idx + 1}"} for idx in range(RECIPES)]
+    recipe_rows = []
+    for medicine in medicines:
+        for component_number in range(1, rng.randint(1, 4) + 1):
+            quantity = rng.randint(1, 3)
+            for component_id in rng.sample(range(1, COMPONENTS + 1), rng.randint(1, 4)):
+                recipe_rows.append((medicine["id"], component_id, component_number, quantity))
+
+    names = {medicine["id"]: medicine["name"] for medicine in medicines}
+    catalog_rows = [
+        {"recipe": names[medicine_id], "component_number": number, "id": component_id, "quantity": quantity}
+        for medicine_id, component_id, number, quantity in recipe_rows
+    ]
+    inventories = [
+        {component_id: rng.randint(1, 6) for component_id in rng.sample(range(1, COMPONENTS + 1), INVENTORY_LINES)}
+        for _ in range(PLAYERS)
+    ]
+    return medicines, recipe_rows, RecipeCatalog(medicines, [], catalog_rows, []), inventories
+
+
+def summary(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    return f"mean {sum(ordered) / len(ordered) * 1e6:9.1f} us  p95 {ordered[int(len(ordered) * 0.95)] * 1e6:9.1f} us"
+
+
+def time_each(call, inputs) -> list[float]:
+    timings = []
+    for value in inputs:
+        start = time.perf_counter()
+        call(value)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def time_each_async(call, inputs) -> list[float]:
+    timings = []
+    for value in inputs:
+        start = time.perf_counter()
+        await call(value)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def load_tables(conn, medicines, recipe_rows, inventories) -> None:
+    await conn.execute(
+        """
+        CREATE TEMPORARY TABLE players (id integer PRIMARY KEY);
+        CREATE TEMPORARY TABLE player_inventories (
+            player_id integer NOT NULL, component_id integer NOT NULL, component_quantity integer NOT NULL,
+            UNIQUE (player_id, component_id)
+        );
+        CREATE TEMPORARY TABLE medicines (id integer PRIMARY KEY, name text, display_name text);
+        CREATE TEMPORARY TABLE medicine_recipes (
+            medicine_id integer, component_id integer, component_number integer, component_quantity integer
+        );
+        """
+    )
+    await conn.copy_records_to_table("players", records=[(player_id,) for player_id in range(1, PLAYERS + 1)])
+    await conn.copy_records_to_table("player_inventories", records=[
+        (player_id, component_id, quantity)
+        for player_id, inventory in enumerate(inventories, start=1)
+        for component_id, quantity in inventory.items()
+    ])
+    await conn.copy_records_to_table(
+        "medicines", records=[(medicine["id"], medicine["name"], medicine["display_name"]) for medicine in medicines])
+    await conn.copy_records_to_table("medicine_recipes", records=recipe_rows)
+    await conn.execute("ANALYZE players; ANALYZE player_inventories; ANALYZE medicines; ANALYZE medicine_recipes;")
+
+
+async def database_rows(medicines, recipe_rows, catalog, inventories) -> list[str]:
+    config = pool_config()
+    try:
+        conn = await asyncpg.connect(**{key: config[key] for key in CONNECT_KEYS})
+    except (OSError, asyncpg.PostgresError) as error:
+        return [f"  fetch + possible     skipped: {error}", f"  recipe CTE           skipped: {error}"]
+
+    try:
+        await load_tables(conn, medicines, recipe_rows, inventories)
+        player_ids = range(1, PLAYERS + 1)
+
+        async def fetch_and_compute(player_id):
+            rows = await conn.fetch(INVENTORY_QUANTITIES_SQL, player_id)
+            return catalog.possible_crafts("Medicine", {row["component_id"]: row["component_quantity"] for row in rows})
+
+        async def cte(player_id):
+            return await conn.fetch(POSSIBLE_MEDICINES_SQL, player_id)
+
+        # Warm both statements into the connection's cache before timing
+        await fetch_and_compute(1)
+        await cte(1)
+        for player_id in player_ids:
+            in_memory = {entry["id"]: entry["max_crafts"] for entry in await fetch_and_compute(player_id)}
+            queried = {row["id"]: int(row["max_crafts"]) for row in await cte(player_id)}
+            assert in_memory == queried, player_id
+
+        fetched = await time_each_async(fetch_and_compute, player_ids)
+        queried = await time_each_async(cte, player_ids)
+        return [
+            f"  fetch + possible     {summary(fetched)}",
+            f"  recipe CTE           {summary(queried)}   (results match for all {PLAYERS} players)"
+        ]
+    finally:
+        await conn.close()
+
+
+async def main():
+    medicines, recipe_rows, catalog, inventories = fixture(random.Random(6))
+    matrix = catalog.craft_matrix("Medicine")
+
+    print(f"{RECIPES} recipes ({len(recipe_rows):,} recipe rows), {PLAYERS} players x {INVENTORY_LINES} inventory lines")
+    print(f"  possible_crafts      {summary(time_each(lambda inventory: catalog.possible_crafts('Medicine', inventory), inventories))}")
+    print(f"  craft matrix         {summary(time_each(lambda inventory: matrix.max_crafts(matrix.inventory_matrix([inventory])), inventories))}")
+    for line in await database_rows(medicines, recipe_rows, catalog, inventories):
+        print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
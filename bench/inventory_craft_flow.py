@@ -0,0 +1,129 @@
+"""The /craft inventory work for a 500-line inventory: Inventory lookups against the old list-of-dicts scans
+
+A flow is the inventory handling one /craft message does:
+  - build the inventory from its rows
+  - check the recipe
+  - list the swappable ingredients held
+  - read the boost quantity
+  - confirm every ingredient
+  - group the inventory for display
+
+The recipe has three fixed ingredients, a six-way swappable group and a boost, all held in an inventory of 500
+synthetic rows. Each side runs 2,000 flows, and the best of three runs is reported in microseconds per flow, with the
+old flow's time over the new one's as the speedup. Nothing touches the database.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+import utils
+from catalog import RecipeCatalog
+from inventory import Inventory
+
+LINES = 500
+FLOWS = 2_000
+
+
+def synthetic_rows(rng: random.Random) -> list[dict]:
+    # Shaped like the records PLAYER_INVENTORY_SQL returns
+    return [
+        {"id": component_id, "name": f"component_{component_id}", "display_name": f"Component {component_id}",
+         "quantity": rng.randint(1, 20)}
+        for component_id in rng.sample(range(1, 5_000), LINES)
+    ]
+
+
+def synthetic_recipe(rows: list[dict], rng: random.Random):
+    """A recipe of three fixed ingredients and a six-way swappable group, all held, plus a held boost"""
+    def component(row, number):
+        return {"recipe": "test_recipe", "component_number": number, "id": row["id"], "name": row["name"],
+                "display_name": row["display_name"], "quantity": 1, "rank_quantity": 3}
+
+    picked = rng.sample(rows, 10)
+    groups = [[component(row, number)] for number, row in enumerate(picked[:3], start=1)]
+    groups.append([component(row, 4) for row in picked[3:9]])
+    requirements = RecipeCatalog._requirements({"test_recipe": {"recipe": groups}})["test_recipe"]
+    return groups, requirements, picked[9]["display_name"]
+
+
+async def old_flow(rows, groups, requirements, boost_type, essence_names, common_flora_names):
+    player_inventory = [dict(row) for row in rows]
+
+    quantities = defaultdict(int)
+    for row in player_inventory:
+        quantities[row["id"]] += row["quantity"]
+    RecipeCatalog.max_crafts(requirements, quantities)
+
+    inventory_dict = {item["display_name"]: item["quantity"] for item in player_inventory}
+    available = []
+    for item in groups[-1]:
+        if item["display_name"] in inventory_dict:
+            for _ in range(inventory_dict[item["display_name"]]):
+                available.append(item)
+
+    for item in player_inventory:
+        if item["display_name"] == boost_type:
+            break
+
+    for group in groups:
+        for component in group:
+            for item in player_inventory:
+                if item["display_name"] == component["display_name"]:
+                    break
+
+    grouped = ([], [], [])
+    for item in player_inventory:
+        if item["display_name"] in essence_names:
+            grouped[0].append(item)
+        elif item["display_name"] in common_flora_names:
+            grouped[1].append(item)
+        else:
+            grouped[2].append(item)
+
+
+async def new_flow(rows, groups, requirements, boost_type, essence_names, common_flora_names):
+    player_inventory = Inventory(rows)
+    RecipeCatalog.max_crafts(requirements, player_inventory.quantities)
+    await utils.find_available_ingredients(player_inventory, groups[-1])
+    player_inventory.quantity_by_display_name(boost_type)
+    for group in groups:
+        for component in group:
+            await utils.check_inventory(player_inventory, component["display_name"])
+    player_inventory.grouped(essence_names, common_flora_names)
+
+
+async def timed(flow, *args) -> float:
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(FLOWS):
+            await flow(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def main():
+    rng = random.Random(16)
+    rows = synthetic_rows(rng)
+    groups, requirements, boost_type = synthetic_recipe(rows, rng)
+    essence_names = {row["display_name"] for row in rows[:20]}
+    common_flora_names = {row["display_name"] for row in rows[20:80]}
+    args = (rows, groups, requirements, boost_type, essence_names, common_flora_names)
+
+    old = await timed(old_flow, *args)
+    new = await timed(new_flow, *args)
+
+    print(f"/craft inventory flow, {LINES} inventory lines, {FLOWS:,} flows")
+    print(f"  list of dicts   {old / FLOWS * 1e6:8.1f} us/flow")
+    print(f"  Inventory       {new / FLOWS * 1e6:8.1f} us/flow")
+    print(f"  speedup         {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""Inventory write latency as player_inventories grows from 1,000 to 1,000,000 rows
+
+Compares the old /add and /sub write, an UPDATE, an INSERT ... WHERE NOT EXISTS and a DELETE sweeping the whole
+table for rows below one, with the single INVENTORY_DELTA_SQL statement. Each table size gets 500 deltas in the mix
+the commands produce: top-ups of held components, first writes of new ones, partial subtractions and subtractions
+that empty a row. The old write is timed with component ids rather than its name subqueries, so only the write
+pattern differs.
+
+Needs a reachable Postgres configured through the same DB_* variables as the bot. Everything runs against a
+temporary player_inventories table, which shadows the real one for this connection only, so no bot data is touched.
+Output is one line per table size with the mean and p95 milliseconds per delta for each write; the old write's
+cost grows with the table because of its sweep, the delta statement's should stay flat.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+import asyncpg
+
+from db import INVENTORY_DELTA_SQL
+from migrations import CONNECT_KEYS
+from pool import pool_config
+
+TABLE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DELTAS = 500
+LINES_PER_PLAYER = 50
+
+OLD_UPDATE_SQL = """
+    UPDATE player_inventories
+    SET component_quantity = component_quantity + $3
+    WHERE player_id = $1 AND component_id = $2;
+"""
+OLD_INSERT_SQL = """
+    INSERT INTO player_inventories (player_id, component_id, component_quantity)
+    SELECT $1, $2, $3
+    WHERE NOT EXISTS (
+        SELECT 1 FROM player_inventories WHERE player_id = $1 AND component_id = $2
+    );
+"""
+OLD_SWEEP_SQL = "DELETE FROM player_inventories WHERE component_quantity < 1;"
+
+
+async def fill(conn, rows: int) -> None:
+    await conn.execute("TRUNCATE player_inventories;")
+    await conn.execute(
+        """
+        INSERT INTO player_inventories (player_id, component_id, component_quantity)
+        SELECT n / $2 + 1, n % $2 + 1, 10
+        FROM generate_series(0, $1 - 1) AS n;
+        """,
+        rows, LINES_PER_PLAYER
+    )
+    await conn.execute("ANALYZE player_inventories;")
+
+
+def deltas(rows: int, rng: random.Random) -> list[tuple[int, int, int]]:
+    players = rows // LINES_PER_PLAYER
+    mix = []
+    for _ in range(DELTAS):
+        player_id = rng.randint(1, players)
+        kind = rng.random()
+        if kind < 0.4:
+            mix.append((player_id, rng.randint(1, LINES_PER_PLAYER), rng.randint(1, 5)))
+        elif kind < 0.6:
+            mix.append((player_id, LINES_PER_PLAYER + rng.randint(1, 1_000), rng.randint(1, 5)))
+        elif kind < 0.9:
+            mix.append((player_id, rng.randint(1, LINES_PER_PLAYER), -rng.randint(1, 3)))
+        else:
+            mix.append((player_id, rng.randint(1, LINES_PER_PLAYER), -10))
+    return mix
+
+
+async def old_write(conn, player_id, component_id, delta) -> None:
+    async with conn.transaction():
+        await conn.execute(OLD_UPDATE_SQL, player_id, component_id, delta)
+        await conn.execute(OLD_INSERT_SQL, player_id, component_id, delta)
+        await conn.execute(OLD_SWEEP_SQL)
+
+
+async def new_write(conn, player_id, component_id, delta) -> None:
+    await conn.fetchrow(INVENTORY_DELTA_SQL, player_id, component_id, delta)
+
+
+async def timed(conn, write, mix) -> list[float]:
+    timings = []
+    for args in mix:
+        start = time.perf_counter()
+        await write(conn, *args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summary(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    mean = sum(ordered) / len(ordered)
+    return f"mean {mean * 1000:7.3f} ms  p95 {ordered[int(len(ordered) * 0.95)] * 1000:7.3f} ms"
+
+
+async def main():
+    config = pool_config()
+    conn = await asyncpg.connect(**{key: config[key] for key in CONNECT_KEYS})
+    try:
+        await conn.execute(
+            """
+            CREATE TEMPORARY TABLE player_inventories (
+                player_id integer NOT NULL,
+                component_id integer NOT NULL,
+                component_quantity integer NOT NULL,
+                UNIQUE (player_id, component_id)
+            );
+            """
+        )
+        rng = random.Random(1)
+        print(f"{DELTAS} deltas per table size, {LINES_PER_PLAYER} lines per player")
+        for rows in TABLE_SIZES:
+            mix = deltas(rows, rng)
+            await fill(conn, rows)
+            old = await timed(conn, old_write, mix)
+            await fill(conn, rows)
+            new = await timed(conn, new_write, mix)
+            print(f"  {rows:>9,} rows   old write {summary(old)}   delta statement {summary(new)}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
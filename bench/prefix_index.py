@@ -0,0 +1,62 @@
+"""Autocomplete lookup latency: PrefixIndex against the linear scan the autocompletes used before it
+
+The catalog is 10,000 synthetic names of one to three made-up words. The 1,000 queries are keystroke sized: nine in
+ten are the first one to four characters of a real name, and the rest are random three-letter misses. Before timing,
+every query is checked to find the same names both ways. The output gives the one-off index build in milliseconds
+and the best-of-five microseconds per query for the index and the scan. The speedup line is the scan time divided by
+the index time.
+"""
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+from catalog import PrefixIndex
+
+ENTRIES = 10_000
+QUERIES = 1_000
+
+
+def synthetic_names(count: int, rng: random.Random) -> list[str]:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))).title() for _ in range(count // 3)]
+    names = set()
+    while len(names) < count:
+        names.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    return list(names)
+
+
+def linear_scan(names: list[str], current: str) -> list[str]:
+    # What the autocompletes did before the index: test every name on every keystroke
+    return [name for name in names if name.lower().startswith(current.lower()) or name.startswith(current)][:25]
+
+
+def main():
+    rng = random.Random(11)
+    names = synthetic_names(ENTRIES, rng)
+    # Keystroke-sized queries: the first one to four characters of real names, plus some misses
+    queries = [rng.choice(names)[:rng.randint(1, 4)] for _ in range(QUERIES - QUERIES // 10)]
+    queries += ["".join(rng.choices(string.ascii_lowercase, k=3)) for _ in range(QUERIES // 10)]
+
+    build = timeit.timeit(lambda: PrefixIndex(names), number=5) / 5
+    index = PrefixIndex(names)
+
+    # Both must find the same names; the scan returns them in catalog order, the index alphabetically
+    for query in queries:
+        every_match = [name for name in names if name.lower().startswith(query.lower())]
+        assert sorted(index.search(query, limit=ENTRIES)) == sorted(every_match), query
+
+    indexed = min(timeit.repeat(lambda: [index.search(query) for query in queries], number=1, repeat=5))
+    scanned = min(timeit.repeat(lambda: [linear_scan(names, query) for query in queries], number=1, repeat=3))
+
+    print(f"PrefixIndex over {ENTRIES:,} names, {len(queries):,} queries")
+    print(f"  build         {build * 1000:8.2f} ms")
+    print(f"  index search  {indexed / len(queries) * 1e6:8.2f} us/query")
+    print(f"  linear scan   {scanned / len(queries) * 1e6:8.2f} us/query")
+    print(f"  speedup       {scanned / indexed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Equivalence of the in-memory craftability engines with the recipe CTE they replaced
+
+Run from the repository root with `python -m unittest discover tests`.
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bot"))
+
+from catalog import RecipeCatalog
+
+RECIPES = 500
+INVENTORIES = 1_000
+COMPONENTS = 300
+
+
+def synthetic_tables(rng: random.Random, recipes: int = RECIPES):
+    """Returns (items, recipe table rows, catalog recipe rows) shaped like medicines / medicine_recipes"""
+    items = [{"id": idx + 1, "name": f"recipe_{idx + 1}", "display_name": f"Recipe {idx + 1}"} for idx in range(recipes)]
+    table_rows = []
+    for item in items:
+        for component_number in range(1, rng.randint(1, 4) + 1):
+            quantity = rng.randint(1, 3)
+            # Some groups offer the same component twice, and components repeat across groups
+            for component_id in rng.choices(range(1, COMPONENTS + 1), k=rng.randint(1, 4)):
+                table_rows.append({
+                    "medicine_id": item["id"], "component_id": component_id,
+                    "component_number": component_number,
+                    # Quantities usually agree within a group, but not always
+                    "component_quantity": quantity if rng.random() < 0.9 else rng.randint(1, 3)
+                })
+
+    names = {item["id"]: item["name"] for item in items}
+    catalog_rows = [
+        {"recipe": names[row["medicine_id"]], "component_number": row["component_number"], "id": row["component_id"],
+         "quantity": row["component_quantity"]}
+        for row in table_rows
+    ]
+    return items, table_rows, catalog_rows
+
+
+def synthetic_inventory(rng: random.Random, lines: int = 50) -> dict[int, int]:
+    return {component_id: rng.randint(1, 6) for component_id in rng.sample(range(1, COMPONENTS + 1), lines)}
+
+
+def cte_max_crafts(table_rows, inventory: dict[int, int]) -> dict[int, int]:
+    """The rules of the get_player_possible_* CTE, stage by stage, returning {recipe_id: max_crafts}"""
+    # player_component_quantities: per (recipe, group), the player's total over every row of the group
+    group_totals = {}
+    for row in table_rows:
+        key = (row["medicine_id"], row["component_number"])
+        group_totals[key] = group_totals.get(key, 0) + inventory.get(row["component_id"], 0)
+
+    # sufficient_components and craftable_medicines: integer division per row, minimum per recipe, kept if above 0
+    crafts = {}
+    for row in table_rows:
+        row_crafts = group_totals[(row["medicine_id"], row["component_number"])] // row["component_quantity"]
+        if row["medicine_id"] not in crafts or row_crafts < crafts[row["medicine_id"]]:
+            crafts[row["medicine_id"]] = row_crafts
+    return {recipe_id: count for recipe_id, count in crafts.items() if count > 0}
+
+
+class CraftabilityEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(6)
+        cls.items, cls.table_rows, catalog_rows = synthetic_tables(rng)
+        cls.catalog = RecipeCatalog(cls.items, cls.items, catalog_rows, catalog_rows)
+        cls.inventories = [synthetic_inventory(rng) for _ in range(INVENTORIES)]
+        # Inventories that cover many recipes many times over, and one with nothing in it
+        cls.inventories += [{component_id: rng.randint(5, 40) for component_id in range(1, COMPONENTS + 1)} for _ in range(10)]
+        cls.inventories.append({})
+
+    @staticmethod
+    def by_id(crafts) -> dict[int, int]:
+        return {entry["id"]: entry["max_crafts"] for entry in crafts}
+
+    def test_possible_crafts_matches_cte(self):
+        for craft_type in ("Medicine", "Alchemy"):
+            for inventory in self.inventories:
+                self.assertEqual(self.by_id(self.catalog.possible_crafts(craft_type, inventory)),
+                                 cte_max_crafts(self.table_rows, inventory))
+
+    def test_party_crafts_matches_possible_crafts(self):
+        for craft_type in ("Medicine", "Alchemy"):
+            party = self.catalog.party_crafts(craft_type, self.inventories)
+            self.assertEqual(len(party), len(self.inventories))
+            for inventory, crafts in zip(self.inventories, party):
+                self.assertEqual(self.by_id(crafts), self.by_id(self.catalog.possible_crafts(craft_type, inventory)))
+
+    def test_possible_crafts_carries_recipe_entries(self):
+        inventory = {component_id: 50 for component_id in range(1, COMPONENTS + 1)}
+        for entry in self.catalog.possible_crafts("Medicine", inventory):
+            self.assertEqual(entry["display_name"], f"Recipe {entry['id']}")
+            self.assertTrue(entry["recipe"])
+
+    def test_unknown_craft_type(self):
+        self.assertEqual(self.catalog.possible_crafts("Poison", self.inventories[0]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()